@@ -1,16 +1,26 @@
 import streamlit as st
 import plotly.graph_objects as go
-import plotly.express as px
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
 
 # Import de votre classe EarthDataAnalyzer existante
 import sys
 import os
+from contextlib import nullcontext
 sys.path.append(os.path.dirname(__file__))
 
+from earth_events import CLIMATE_EVENTS
+from earth_cache import EarthDataCache
+from earth_cube_store import open_cube
+from earth_smoothing import SmoothingTable
+from earth_downsampling import downsample_indices
+from earth_figure_cache import FigureCache
+from earth_live import LiveFeed, live_feed_path
+from earth_observations import OBSERVATION_DIR, ObservationSource, list_observation_files, overlay_observations
+from earth_summary import EarthSummary
+from earth_timing import TIMER
+
 try:
     from Earth import EarthDataAnalyzer
 except ImportError:
@@ -18,8 +28,19 @@ except ImportError:
     
     # Version de secours si l'import échoue
     class EarthDataAnalyzer:
-        def __init__(self, data_type):
+        GENERATOR_VERSION = 0
+        RESOLUTIONS = {'annual': ('YE', 1)}
+        
+        def __init__(self, data_type, seed=None, resolution='annual', compact=False):
+            if resolution not in self.RESOLUTIONS:
+                raise ValueError(f"Résolution non supportée par la version simplifiée: {resolution}")
             self.data_type = data_type
+            self.resolution = resolution
+            self.compact = compact  # ignoré: types complets uniquement
+            self.seed = seed
+            self.rng = np.random.default_rng(seed)
+            self.start_year = 1850
+            self.end_year = 2025
             self.config = self._get_config()
             
         def _get_config(self):
@@ -35,9 +56,9 @@ except ImportError:
             }
             return configs.get(self.data_type, {"base_value": 100, "unit": "Unités", "description": "Données génériques"})
         
-        def generate_earth_data(self):
+        def generate_earth_data(self, columns=None):
             # Simulation de données simplifiée - CORRIGE avec 'YE'
-            dates = pd.date_range(start='1850-01-01', end='2025-12-31', freq='YE')  # CORRECTION ICI
+            dates = pd.date_range(start=f'{self.start_year}-01-01', end=f'{self.end_year}-12-31', freq='YE')  # CORRECTION ICI
             data = {'Year': [date.year for date in dates]}
             
             # Données simulées basiques
@@ -52,14 +73,175 @@ except ImportError:
             else:
                 trend = base_value * np.ones_like(years)
             
-            data['Base_Value'] = trend + np.random.normal(0, base_value * 0.1, len(years))
+            data['Base_Value'] = trend + self.rng.normal(0, base_value * 0.1, len(years))
             data['Risk_Level'] = np.clip(20 + 0.5 * (years - 1850), 0, 100)
             data['Climate_Trend'] = 1 + 0.005 * (years - 1850)
             data['Human_Impact'] = 1 + 0.01 * (years - 1850)
-            data['Extreme_Events'] = 1 + 0.002 * (years - 1850) + np.random.normal(0, 0.1, len(years))
+            data['Extreme_Events'] = 1 + 0.002 * (years - 1850) + self.rng.normal(0, 0.1, len(years))
             data['Future_Projection'] = data['Base_Value'] * (1 + 0.01 * np.maximum(0, years - 2020))
             
-            return pd.DataFrame(data)
+            df = pd.DataFrame(data)
+            if columns is not None:
+                df = df[['Year'] + [name for name in columns if name in df.columns]]
+            return df
+
+# Colonnes réellement affichées par le dashboard (les autres ne sont pas simulées)
+DASHBOARD_COLUMNS = [
+    'Base_Value', 'Seasonal_Min', 'Seasonal_Max', 'Climate_Trend',
+    'Extreme_Events', 'Human_Impact', 'Risk_Level', 'Future_Projection'
+]
+
+# Résolutions proposées dans le dashboard
+DASHBOARD_RESOLUTIONS = {
+    "annual": "Annuelle",
+    "monthly": "Mensuelle",
+}
+
+def time_axis(df):
+    """Axe des abscisses des graphiques: dates en infra-annuel, années sinon"""
+    return df['Date'] if 'Date' in df.columns else df['Year']
+
+def decimal_years(df):
+    """Temps en années décimales (pour les ajustements de tendance)"""
+    if 'Date' not in df.columns:
+        return df['Year']
+    return df['Year'] + (df['Date'].dt.dayofyear - 1) / 365.25
+
+def year_position(df, year):
+    """Position du début d'une année sur l'axe des abscisses"""
+    if 'Date' in df.columns:
+        return pd.Timestamp(year=year, month=1, day=1)
+    return year
+
+# Nombre maximal de points envoyés au navigateur par trace, par graphique
+CHART_POINT_BUDGETS = {
+    "timeline": 2000,
+    "risk": 2000,
+    "extreme_events": 600,
+}
+
+def downsample(df, column, budget, method='lttb'):
+    """Lignes à tracer pour `column` dans la limite de `budget` points
+    
+    LTTB pour les courbes, min/max par tranche pour les barres. Le budget
+    s'applique à la période affichée: resserrer la période affine le tracé.
+    """
+    if len(df) <= budget:
+        return df
+    return df.iloc[downsample_indices(decimal_years(df), df[column], budget, method)]
+
+# Cache des figures Plotly sérialisées, partagé entre sessions
+FIGURE_CACHE_MAX_ENTRIES = 256
+FIGURE_CACHE_MAX_BYTES = 64 * 2 ** 20
+
+@st.cache_resource
+def get_figure_cache():
+    """Instance unique du cache de figures (survit aux reruns du script)"""
+    return FigureCache(FIGURE_CACHE_MAX_ENTRIES, FIGURE_CACHE_MAX_BYTES)
+
+# Jeux de données en types compacts (float32, années int16, catégories): moitié moins
+# de mémoire dans les caches et d'octets lus sur disque
+DASHBOARD_COMPACT = True
+
+# Cache des jeux de données générés: borné (éviction LRU) et expirant après une heure
+DATA_CACHE_MAX_ENTRIES = 32
+DATA_CACHE_TTL = 3600
+
+# Cache disque partagé par les workers et conservé entre redémarrages (data/cache/)
+EARTH_DATA_CACHE = EarthDataCache()
+
+# Sources de données proposées: simulation, ou fichiers d'observations de data/observations/
+DATA_SOURCES = {
+    "simulation": "Simulation",
+    "observations": "Observations",
+}
+
+@st.cache_data(max_entries=DATA_CACHE_MAX_ENTRIES, ttl=DATA_CACHE_TTL, show_spinner=False)
+def load_observations(observations, data_type, resolution='annual'):
+    """Fichier d'observations agrégé à la résolution du dashboard
+    
+    `observations` est la clé du fichier (ObservationSource.key): un fichier ou
+    un manifeste modifié est relu.
+    """
+    analyzer = EarthDataAnalyzer(data_type, resolution=resolution, compact=DASHBOARD_COMPACT)
+    return ObservationSource(observations[0]).read(analyzer)
+
+@st.cache_data(max_entries=DATA_CACHE_MAX_ENTRIES, ttl=DATA_CACHE_TTL, show_spinner=False)
+def load_earth_data(data_type, seed, start_year, end_year, resolution='annual',
+                    columns=tuple(DASHBOARD_COLUMNS), observations=None):
+    """Génère (ou relit depuis le cache) les données d'un type pour une graine et une période
+    
+    Avec `observations`, les colonnes observées remplacent les colonnes simulées
+    et le jeu de données est restreint à la période observée.
+    """
+    analyzer = EarthDataAnalyzer(data_type, seed=seed, resolution=resolution, compact=DASHBOARD_COMPACT)
+    analyzer.start_year, analyzer.end_year = start_year, end_year
+    df = EARTH_DATA_CACHE.get_or_generate(analyzer, columns=list(columns))
+    if observations is not None:
+        with TIMER.stage('observations'):
+            df = overlay_observations(df, load_observations(observations, data_type, resolution))
+    return df
+
+@st.cache_data(max_entries=DATA_CACHE_MAX_ENTRIES, ttl=DATA_CACHE_TTL, show_spinner=False)
+def load_earth_summary(data_type, seed, start_year, end_year, resolution='annual', observations=None):
+    """Statistiques de synthèse (KPI, radar, insights), calculées une fois par jeu de données"""
+    return EarthSummary(load_earth_data(data_type, seed, start_year, end_year, resolution,
+                                        observations=observations))
+
+# Résolutions (en degrés) proposées pour la carte globale
+HEATMAP_GRIDS = [10.0, 5.0, 2.5, 1.0]
+
+@st.cache_resource(max_entries=DATA_CACHE_MAX_ENTRIES, show_spinner=False)
+def load_spatial_cube(data_type, seed, start_year, end_year, resolution, grid_deg):
+    """Cube spatio-temporel sur disque, ouvert en memmap (None sans EarthDataAnalyzer complet)
+    
+    Le cube est une ressource partagée (non copiée) entre sessions; ses pages
+    sont partagées entre workers via le cache du système de fichiers.
+    """
+    analyzer = EarthDataAnalyzer(data_type, seed=seed, resolution=resolution)
+    if not hasattr(analyzer, 'generate_spatial_cube'):
+        return None
+    analyzer.start_year, analyzer.end_year = start_year, end_year
+    return open_cube(analyzer, grid_deg)
+
+# Lissage: fenêtres (en années) proposées par le curseur et noyaux disponibles
+SMOOTHING_MAX_YEARS = 20
+SMOOTHING_KERNELS = {
+    "boxcar": "Moyenne mobile",
+    "gaussian": "Gaussien",
+    "loess": "Régression locale (LOESS)",
+}
+
+@st.cache_data(max_entries=DATA_CACHE_MAX_ENTRIES, ttl=DATA_CACHE_TTL, show_spinner=False)
+def load_smoothed_series(data_type, seed, start_year, end_year, resolution='annual', kernel='boxcar',
+                         observations=None):
+    """Base_Value lissée pour chaque fenêtre du curseur (clé: nombre d'années)"""
+    df = load_earth_data(data_type, seed, start_year, end_year, resolution, observations=observations)
+    periods_per_year = EarthDataAnalyzer.RESOLUTIONS[resolution][1]
+    windows = {years: int(round(years * periods_per_year)) for years in range(1, SMOOTHING_MAX_YEARS + 1)}
+    table = SmoothingTable(df['Base_Value'].to_numpy(), windows=set(windows.values()), kernel=kernel)
+    return {years: table[window] for years, window in windows.items()}
+
+# Mode direct: intervalle (en secondes) entre deux lectures du flux
+LIVE_REFRESH_SECONDS = 2
+
+@st.cache_resource(show_spinner=False)
+def get_live_feed(path):
+    """Flux en direct partagé entre sessions (un seul suivi du fichier, un seul jeu de tampons)"""
+    return LiveFeed(path)
+
+# Taille de l'ensemble Monte Carlo des projections futures
+ENSEMBLE_MEMBERS = 1000
+
+@st.cache_data(max_entries=DATA_CACHE_MAX_ENTRIES, ttl=DATA_CACHE_TTL, show_spinner=False)
+def load_projection_ensemble(data_type, seed, start_year, end_year, resolution='annual',
+                             members=ENSEMBLE_MEMBERS):
+    """Percentiles 5/50/95 de l'ensemble de projections (None sans EarthDataAnalyzer complet)"""
+    analyzer = EarthDataAnalyzer(data_type, seed=seed, resolution=resolution, compact=DASHBOARD_COMPACT)
+    if not hasattr(analyzer, 'generate_projection_ensemble'):
+        return None
+    analyzer.start_year, analyzer.end_year = start_year, end_year
+    return analyzer.generate_projection_ensemble(members=members)
 
 class EarthStreamlitDashboard:
     def __init__(self):
@@ -128,72 +310,231 @@ class EarthStreamlitDashboard:
             value=(1950, 2025)
         )
         
-        smoothing = st.sidebar.slider(
-            "Fenêtre de lissage:",
-            min_value=1,
-            max_value=20,
-            value=10
+        # Contrôles propres à un graphique: remplis par le fragment du graphique concerné,
+        # si bien que les modifier ne relance que ce fragment
+        chart_controls = st.sidebar.container()
+        
+        resolution = st.sidebar.selectbox(
+            "Résolution temporelle:",
+            options=list(DASHBOARD_RESOLUTIONS),
+            format_func=DASHBOARD_RESOLUTIONS.get
         )
         
-        alert_threshold = st.sidebar.slider(
-            "Seuil d'alerte risque:",
+        # Graine de simulation: même graine = mêmes données, d'une session à l'autre
+        seed = st.sidebar.number_input(
+            "Graine aléatoire:",
             min_value=0,
-            max_value=100,
-            value=70
+            value=42,
+            step=1
         )
         
-        # Générer les données
-        analyzer = EarthDataAnalyzer(data_type)
-        df = analyzer.generate_earth_data()
-        df_filtered = df[(df['Year'] >= year_range[0]) & (df['Year'] <= year_range[1])].copy()  # CORRECTION ICI
-        
-        # Appliquer le lissage - CORRIGE avec .loc
-        if smoothing > 1:
-            df_filtered.loc[:, 'Smoothed_Value'] = df_filtered['Base_Value'].rolling(window=smoothing, center=True).mean()  # CORRECTION ICI
-        
-        # KPI Cards
-        self.display_kpi_cards(df, analyzer)
-        
-        # Graphiques principaux
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            self.plot_main_timeline(df_filtered, analyzer, smoothing)
-        
-        with col2:
-            self.plot_risk_analysis(df_filtered, analyzer, alert_threshold)
-        
-        # Graphiques secondaires
-        col3, col4 = st.columns(2)
-        
-        with col3:
-            self.plot_seasonal_analysis(df_filtered, analyzer)
-        
-        with col4:
-            self.plot_impact_analysis(df, analyzer)
-        
-        # Graphiques supplémentaires
-        col5, col6 = st.columns(2)
-        
-        with col5:
-            self.plot_future_projections(df, analyzer)
-        
-        with col6:
-            self.plot_extreme_events(df_filtered, analyzer)
-        
-        # Carte thermique
-        st.subheader("🌐 Carte Globale des Données Environnementales")
-        self.plot_global_heatmap(analyzer)
+        # Source des données: les observations remplacent les colonnes simulées qu'elles contiennent
+        source = st.sidebar.radio(
+            "Source des données:",
+            options=list(DATA_SOURCES),
+            format_func=DATA_SOURCES.get,
+            horizontal=True
+        )
+        observations = self.select_observations() if source == "observations" else None
+        
+        # Mode direct: KPI et courbe alimentés par le flux, rafraîchis sans rerun complet
+        live = st.sidebar.toggle("🔴 Mode direct", value=False)
+        
+        # Chronométrage des étapes du rerun (panneau de performance en bas de la barre latérale)
+        timing = st.sidebar.toggle("⏱️ Chronométrage des étapes", value=TIMER.enabled, key="stage_timing")
+        
+        # Le run est fermé même si Streamlit interrompt le script (rerun, st.stop)
+        with TIMER.run('dashboard') if timing else nullcontext([]) as stages:
+            # Générer les données (réutilisées tant que type, graine et période sont inchangés)
+            analyzer = EarthDataAnalyzer(data_type, seed=int(seed), resolution=resolution)
+            with TIMER.stage('load_data'):
+                try:
+                    df = load_earth_data(data_type, analyzer.seed, analyzer.start_year, analyzer.end_year,
+                                         analyzer.resolution, observations=observations)
+                except (ValueError, KeyError, ImportError) as error:
+                    st.sidebar.error(f"Observations illisibles: {error}. Affichage des données simulées.")
+                    observations = None
+                    df = load_earth_data(data_type, analyzer.seed, analyzer.start_year, analyzer.end_year,
+                                         analyzer.resolution)
+            if observations is not None:
+                self.display_observation_status(df)
+            with TIMER.stage('filter'):
+                df_filtered = df[(df['Year'] >= year_range[0]) & (df['Year'] <= year_range[1])].copy()  # CORRECTION ICI
+            
+            # Clés du cache de figures: jeu de données, période, puis paramètres propres à chaque graphique
+            dataset_key = (data_type, analyzer.seed, analyzer.start_year, analyzer.end_year,
+                           analyzer.resolution, analyzer.GENERATOR_VERSION, observations)
+            view_key = dataset_key + (tuple(year_range),)
+            
+            # KPI Cards
+            with TIMER.stage('summary'):
+                summary = load_earth_summary(data_type, analyzer.seed, analyzer.start_year,
+                                             analyzer.end_year, analyzer.resolution, observations)
+            if live:
+                self.live_fragment(analyzer)
+            else:
+                with TIMER.stage('kpi'):
+                    self.display_kpi_cards(summary, analyzer)
+            
+            # Graphiques principaux
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                self.timeline_fragment(df_filtered, analyzer, chart_controls, view_key, observations)
+            
+            with col2:
+                self.risk_fragment(df_filtered, analyzer, chart_controls, view_key)
+            
+            # Graphiques secondaires
+            col3, col4 = st.columns(2)
+            
+            with col3, TIMER.stage('chart/seasonal'):
+                self.plot_seasonal_analysis(df_filtered, analyzer, cache_key=view_key)
+            
+            with col4, TIMER.stage('chart/impact'):
+                self.plot_impact_analysis(summary, analyzer, cache_key=dataset_key)
+            
+            # Graphiques supplémentaires
+            col5, col6 = st.columns(2)
+            
+            with col5:
+                with TIMER.stage('load_ensemble'):
+                    ensemble = load_projection_ensemble(data_type, analyzer.seed, analyzer.start_year,
+                                                        analyzer.end_year, analyzer.resolution)
+                with TIMER.stage('chart/projections'):
+                    self.plot_future_projections(df, analyzer, ensemble,
+                                                 cache_key=dataset_key + (ENSEMBLE_MEMBERS,))
+            
+            with col6, TIMER.stage('chart/extreme_events'):
+                self.plot_extreme_events(df_filtered, analyzer, cache_key=view_key)
+            
+            # Carte thermique
+            st.subheader("🌐 Carte Globale des Données Environnementales")
+            self.heatmap_fragment(analyzer, year_range, dataset_key)
+            
+            # Insights et analyses
+            with TIMER.stage('insights'):
+                self.display_insights(summary, analyzer)
+            
+            # Efficacité du cache de figures
+            self.display_figure_cache_stats()
         
-        # Insights et analyses
-        self.display_insights(df, analyzer)
+        # Durées des étapes de ce rerun et percentiles glissants
+        if timing:
+            self.display_timing_panel(stages)
+    
+    # Fragments: chacun lit ses propres contrôles et se relance seul quand ils changent.
+    # Les autres entrées (données, période, clés de cache) sont celles du dernier run complet.
+    
+    @st.fragment
+    def timeline_fragment(self, df, analyzer, controls, view_key, observations=None):
+        """Timeline principale et ses contrôles de lissage"""
+        with controls:
+            smoothing = st.slider(
+                "Fenêtre de lissage:",
+                min_value=1,
+                max_value=SMOOTHING_MAX_YEARS,
+                value=10
+            )
+            
+            kernel = st.selectbox(
+                "Noyau de lissage:",
+                options=list(SMOOTHING_KERNELS),
+                format_func=SMOOTHING_KERNELS.get
+            )
+        
+        with self.fragment_timing('chart/timeline'):
+            # Appliquer le lissage: toutes les fenêtres sont précalculées, le curseur ne fait qu'une consultation
+            if smoothing > 1:
+                with TIMER.stage('smoothing'):
+                    smoothed = load_smoothed_series(analyzer.data_type, analyzer.seed, analyzer.start_year,
+                                                    analyzer.end_year, analyzer.resolution, kernel,
+                                                    observations)
+                    df = df.assign(Smoothed_Value=smoothed[smoothing][df.index])
+            
+            self.plot_main_timeline(df, analyzer, smoothing,
+                                    cache_key=view_key + (smoothing, kernel if smoothing > 1 else None))
+    
+    @st.fragment
+    def risk_fragment(self, df, analyzer, controls, view_key):
+        """Analyse des risques et son seuil d'alerte"""
+        with controls:
+            alert_threshold = st.slider(
+                "Seuil d'alerte risque:",
+                min_value=0,
+                max_value=100,
+                value=70
+            )
+        
+        with self.fragment_timing('chart/risk'):
+            self.plot_risk_analysis(df, analyzer, alert_threshold,
+                                    cache_key=view_key + (alert_threshold,))
+    
+    @st.fragment(run_every=LIVE_REFRESH_SECONDS)
+    def live_fragment(self, analyzer):
+        """KPI et courbe du flux en direct, relancés seuls toutes les LIVE_REFRESH_SECONDS secondes"""
+        with self.fragment_timing('live'):
+            feed = get_live_feed(live_feed_path(analyzer.data_type))
+            with TIMER.stage('live/poll'):
+                added = feed.poll()
+            monitor = feed.monitor
+            if not monitor.samples:
+                st.info(f"📡 En attente du flux {feed.path} "
+                        f"(simulateur: python earth_live.py {analyzer.data_type})")
+                return
+            
+            # Indicateurs tenus à jour à chaque échantillon par le moniteur (aucun recalcul ici)
+            self.display_kpi_cards(monitor, analyzer)
+            self.plot_live_timeline(feed.frame(), monitor, analyzer)
+            st.caption(f"📡 {monitor.samples:,} échantillons reçus (+{added} depuis le dernier "
+                       f"rafraîchissement), dernier: {monitor.times.last}")
     
-    def display_kpi_cards(self, df, analyzer):
+    @st.fragment
+    def heatmap_fragment(self, analyzer, year_range, dataset_key):
+        """Carte globale, avec ses sélecteurs d'année et de grille"""
+        with self.fragment_timing('chart/heatmap'):
+            self.plot_global_heatmap(analyzer, year_range, cache_key=dataset_key)
+    
+    def select_observations(self):
+        """Fichier d'observations choisi dans la barre latérale: sa clé, ou None"""
+        files = list_observation_files()
+        if not files:
+            st.sidebar.warning(f"Aucun fichier d'observations dans {OBSERVATION_DIR}: données simulées")
+            return None
+        path = st.sidebar.selectbox(
+            "Fichier d'observations:",
+            options=files,
+            format_func=os.path.basename
+        )
+        try:
+            return ObservationSource(path).key()
+        except (ValueError, ImportError) as error:
+            st.sidebar.error(str(error))
+            return None
+    
+    def display_observation_status(self, df):
+        """Colonnes observées, période couverte et bilan de la lecture"""
+        ingest = df.attrs['observations']
+        st.sidebar.caption(
+            f"Observé: {', '.join(ingest['columns'])} ({df['Year'].iloc[0]}-{df['Year'].iloc[-1]}, "
+            f"{ingest['rows']:,} lignes, {ingest['dropped_rows']:,} sans date, "
+            f"{sum(ingest['missing'].values()):,} valeurs manquantes). Autres colonnes simulées."
+        )
+    
+    def fragment_timing(self, name):
+        """Chronomètre un fragment: étape du rerun complet, ou run à part quand il se relance seul"""
+        if TIMER.in_run():
+            return TIMER.stage(name)
+        if st.session_state.get("stage_timing"):
+            return TIMER.run(name)
+        return nullcontext()
+    
+    def display_kpi_cards(self, summary, analyzer):
         """Affiche les cartes KPI"""
         col1, col2, col3, col4 = st.columns(4)
         
         # KPI 1: Valeur actuelle
-        current_value = df['Base_Value'].iloc[-1]
+        current_value = summary.current_value
         unit = analyzer.config["unit"]
         
         with col1:
@@ -206,7 +547,7 @@ class EarthStreamlitDashboard:
             """, unsafe_allow_html=True)
         
         # KPI 2: Tendance
-        recent_trend = ((df['Base_Value'].iloc[-1] / df[df['Year'] >= 2000]['Base_Value'].iloc[0]) - 1) * 100
+        recent_trend = summary.recent_change
         trend_icon = "📈" if recent_trend > 0 else "📉"
         
         with col2:
@@ -219,9 +560,9 @@ class EarthStreamlitDashboard:
             """, unsafe_allow_html=True)
         
         # KPI 3: Risque
-        current_risk = df['Risk_Level'].iloc[-1]
-        risk_color = "#DC143C" if current_risk > 70 else "#FF8C00" if current_risk > 40 else "#2E8B57"
-        risk_text = "Élevé" if current_risk > 70 else "Modéré" if current_risk > 40 else "Faible"
+        current_risk = summary.current_risk
+        risk_color = summary.risk_color
+        risk_text = summary.risk_label
         
         with col3:
             st.markdown(f"""
@@ -233,26 +574,30 @@ class EarthStreamlitDashboard:
             """, unsafe_allow_html=True)
         
         # KPI 4: Changement total
-        total_change = ((df['Base_Value'].iloc[-1] / df['Base_Value'].iloc[0]) - 1) * 100
+        total_change = summary.total_change
         
         with col4:
             st.markdown(f"""
                 <div class="kpi-card">
                     <h3>Changement Total</h3>
                     <h2 style="color: #1E90FF;">{total_change:+.1f}%</h2>
-                    <p>depuis 1850</p>
+                    <p>depuis {summary.start_year}</p>
                 </div>
             """, unsafe_allow_html=True)
     
-    def plot_main_timeline(self, df, analyzer, smoothing):
+    def plot_main_timeline(self, df, analyzer, smoothing, cache_key=None):
         """Graphique de la timeline principale"""
         st.subheader(f"{analyzer.config['description']} - Évolution Temporelle")
+        if self.show_cached_figure('timeline', cache_key):
+            return
         
         fig = go.Figure()
+        budget = CHART_POINT_BUDGETS["timeline"]
         
         # Données brutes
+        raw = downsample(df, 'Base_Value', budget)
         fig.add_trace(go.Scatter(
-            x=df['Year'], y=df['Base_Value'],
+            x=time_axis(raw), y=raw['Base_Value'],
             name='Données brutes',
             line=dict(color='#1E90FF', width=1, dash='dot'),
             opacity=0.6
@@ -260,23 +605,35 @@ class EarthStreamlitDashboard:
         
         # Données lissées
         if smoothing > 1 and 'Smoothed_Value' in df.columns:
+            smoothed = downsample(df, 'Smoothed_Value', budget)
             fig.add_trace(go.Scatter(
-                x=df['Year'], y=df['Smoothed_Value'],
+                x=time_axis(smoothed), y=smoothed['Smoothed_Value'],
                 name=f'Données lissées ({smoothing} ans)',
                 line=dict(color='#FF4500', width=3),
                 opacity=0.9
             ))
         
-        # Tendance linéaire
-        z = np.polyfit(df['Year'], df['Base_Value'], 1)
+        # Tendance linéaire (ajustée sur toutes les données, deux points suffisent à la tracer)
+        with TIMER.stage('polyfit'):
+            observed = df['Base_Value'].notna()
+            z = np.polyfit(decimal_years(df)[observed], df['Base_Value'][observed], 1)
         p = np.poly1d(z)
+        ends = df.iloc[[0, -1]]
         fig.add_trace(go.Scatter(
-            x=df['Year'], y=p(df['Year']),
+            x=time_axis(ends), y=p(decimal_years(ends)),
             name='Tendance linéaire',
             line=dict(color='#32CD32', width=2, dash='dash'),
             opacity=0.8
         ))
         
+        # Événements historiques de la période affichée
+        events = CLIMATE_EVENTS.query(df['Year'].min(), df['Year'].max(), analyzer.data_type)
+        for event in events.itertuples():
+            fig.add_vrect(x0=year_position(df, event.start), x1=year_position(df, event.end + 1),
+                         fillcolor='gray', opacity=0.15, line_width=0,
+                         annotation_text=event.name, annotation_position='top left',
+                         annotation_font_size=9)
+        
         fig.update_layout(
             height=400,
             template='plotly_white',
@@ -285,17 +642,69 @@ class EarthStreamlitDashboard:
             yaxis_title=analyzer.config["unit"]
         )
         
-        st.plotly_chart(fig, use_container_width=True)
+        self.show_figure('timeline', cache_key, fig)
+    
+    def plot_live_timeline(self, df, monitor, analyzer):
+        """Flux en direct: valeurs reçues, moyenne glissante et événements au-delà du 90e centile"""
+        st.subheader(f"{analyzer.config['description']} - Flux en Direct")
+        fig = make_subplots(specs=[[{"secondary_y": True}]])
+        budget = CHART_POINT_BUDGETS["timeline"]
+        
+        raw = downsample(df, 'Base_Value', budget)
+        fig.add_trace(go.Scatter(
+            x=raw['Date'], y=raw['Base_Value'],
+            name='Valeurs reçues',
+            line=dict(color='#1E90FF', width=1),
+            opacity=0.6
+        ), secondary_y=False)
+        
+        smoothed = downsample(df, 'Smoothed_Value', budget)
+        fig.add_trace(go.Scatter(
+            x=smoothed['Date'], y=smoothed['Smoothed_Value'],
+            name=f'Moyenne glissante ({monitor.smoother.window.capacity} échantillons)',
+            line=dict(color='#FF4500', width=3)
+        ), secondary_y=False)
+        
+        # Seuil du 90e centile estimé en flux (P²) et événements qui le dépassent
+        threshold = monitor.threshold.value
+        extreme = downsample(df[df['Extreme_Events'] > threshold], 'Extreme_Events',
+                             CHART_POINT_BUDGETS["extreme_events"], method='minmax')
+        fig.add_trace(go.Bar(
+            x=extreme['Date'], y=extreme['Extreme_Events'],
+            name='Événements extrêmes',
+            marker_color='#FF8C00',
+            opacity=0.5
+        ), secondary_y=True)
+        fig.add_trace(go.Scatter(
+            x=df['Date'].iloc[[0, -1]], y=[threshold, threshold],
+            name=f'Seuil P90: {threshold:.2f}',
+            line=dict(color='red', width=1, dash='dash')
+        ), secondary_y=True)
+        
+        fig.update_layout(
+            height=400,
+            template='plotly_white',
+            showlegend=True,
+            xaxis_title='Date'
+        )
+        fig.update_yaxes(title_text=analyzer.config["unit"], secondary_y=False)
+        fig.update_yaxes(title_text='Intensité relative', secondary_y=True)
+        
+        self.show_figure('live', None, fig)
     
-    def plot_risk_analysis(self, df, analyzer, threshold):
+    def plot_risk_analysis(self, df, analyzer, threshold, cache_key=None):
         """Analyse des risques"""
         st.subheader('Analyse des Risques Environnementaux')
+        if self.show_cached_figure('risk', cache_key):
+            return
         
         fig = make_subplots(specs=[[{"secondary_y": True}]])
+        budget = CHART_POINT_BUDGETS["risk"]
         
         # Niveau de risque
+        risk = downsample(df, 'Risk_Level', budget)
         fig.add_trace(go.Scatter(
-            x=df['Year'], y=df['Risk_Level'],
+            x=time_axis(risk), y=risk['Risk_Level'],
             name='Niveau de risque',
             line=dict(color='#DC143C', width=3),
             fill='tozeroy',
@@ -304,8 +713,9 @@ class EarthStreamlitDashboard:
         
         # Impact humain
         if 'Human_Impact' in df.columns:
+            impact = downsample(df, 'Human_Impact', budget)
             fig.add_trace(go.Scatter(
-                x=df['Year'], y=df['Human_Impact'],
+                x=time_axis(impact), y=impact['Human_Impact'],
                 name='Impact humain',
                 line=dict(color='#8A2BE2', width=2),
                 opacity=0.7
@@ -324,24 +734,26 @@ class EarthStreamlitDashboard:
         fig.update_yaxes(title_text="Niveau de risque (%)", secondary_y=False)
         fig.update_yaxes(title_text="Facteur d'impact", secondary_y=True)
         
-        st.plotly_chart(fig, use_container_width=True)
+        self.show_figure('risk', cache_key, fig)
     
-    def plot_seasonal_analysis(self, df, analyzer):
+    def plot_seasonal_analysis(self, df, analyzer, cache_key=None):
         """Analyse des variations saisonnières"""
         st.subheader('Variations Saisonnières')
+        if self.show_cached_figure('seasonal', cache_key):
+            return
         
         fig = go.Figure()
         
         if 'Seasonal_Min' in df.columns and 'Seasonal_Max' in df.columns:
             fig.add_trace(go.Scatter(
-                x=df['Year'], y=df['Seasonal_Min'],
+                x=time_axis(df), y=df['Seasonal_Min'],
                 name='Minimum saisonnier',
                 line=dict(color='#1E90FF', width=2),
                 fill=None
             ))
             
             fig.add_trace(go.Scatter(
-                x=df['Year'], y=df['Seasonal_Max'],
+                x=time_axis(df), y=df['Seasonal_Max'],
                 name='Maximum saisonnier',
                 line=dict(color='#FF6347', width=2),
                 fill='tonexty',
@@ -350,7 +762,7 @@ class EarthStreamlitDashboard:
         else:
             # Fallback si les colonnes n'existent pas
             fig.add_trace(go.Scatter(
-                x=df['Year'], y=df['Base_Value'],
+                x=time_axis(df), y=df['Base_Value'],
                 name='Valeur de base',
                 line=dict(color='#1E90FF', width=2)
             ))
@@ -363,23 +775,17 @@ class EarthStreamlitDashboard:
             yaxis_title='Facteur d\'amplitude'
         )
         
-        st.plotly_chart(fig, use_container_width=True)
+        self.show_figure('seasonal', cache_key, fig)
     
-    def plot_impact_analysis(self, df, analyzer):
+    def plot_impact_analysis(self, summary, analyzer, cache_key=None):
         """Analyse d'impact avec graphique radar"""
         st.subheader('Analyse d\'Impact - Profil Environnemental')
+        if self.show_cached_figure('impact', cache_key):
+            return
         
-        # Créer un graphique radar
-        categories = ['Tendance', 'Risque', 'Impact Humain', 'Événements Extrêmes', 'Stabilité']
-        
-        # Normaliser les valeurs pour le radar
-        trend_norm = (df['Climate_Trend'].iloc[-1] - df['Climate_Trend'].min()) / (df['Climate_Trend'].max() - df['Climate_Trend'].min()) * 100
-        risk_norm = df['Risk_Level'].iloc[-1]
-        impact_norm = (df['Human_Impact'].iloc[-1] - df['Human_Impact'].min()) / (df['Human_Impact'].max() - df['Human_Impact'].min()) * 100
-        extreme_norm = (df['Extreme_Events'].iloc[-1] - df['Extreme_Events'].min()) / (df['Extreme_Events'].max() - df['Extreme_Events'].min()) * 100
-        stability_norm = 100 - (abs(df['Base_Value'].pct_change().std()) * 1000)
-        
-        values = [trend_norm, risk_norm, impact_norm, extreme_norm, min(stability_norm, 100)]
+        # Scores radar normalisés (0-100), précalculés dans le résumé
+        categories = list(summary.radar)
+        values = list(summary.radar.values())
         
         fig = go.Figure(data=go.Scatterpolar(
             r=values,
@@ -399,34 +805,58 @@ class EarthStreamlitDashboard:
             template='plotly_white'
         )
         
-        st.plotly_chart(fig, use_container_width=True)
+        self.show_figure('impact', cache_key, fig)
     
-    def plot_future_projections(self, df, analyzer):
+    def plot_future_projections(self, df, analyzer, ensemble=None, cache_key=None):
         """Projections futures"""
         st.subheader('Projections Futures avec Incertitude')
+        if self.show_cached_figure('projections', cache_key):
+            return
         
         fig = go.Figure()
         
         # Données historiques
         historical = df[df['Year'] <= 2020]
         fig.add_trace(go.Scatter(
-            x=historical['Year'], y=historical['Base_Value'],
+            x=time_axis(historical), y=historical['Base_Value'],
             name='Données historiques',
             line=dict(color='#1E90FF', width=3),
             opacity=0.8
         ))
         
+        # Bande d'incertitude de l'ensemble Monte Carlo (percentiles 5-95)
+        if ensemble is not None:
+            band = ensemble[ensemble['Year'] >= 2020]
+            fig.add_trace(go.Scatter(
+                x=time_axis(band), y=band['Projection_P95'],
+                line=dict(width=0),
+                showlegend=False,
+                hoverinfo='skip'
+            ))
+            fig.add_trace(go.Scatter(
+                x=time_axis(band), y=band['Projection_P5'],
+                name=f'Intervalle 5-95% ({ENSEMBLE_MEMBERS} membres)',
+                line=dict(width=0),
+                fill='tonexty',
+                fillcolor='rgba(255, 140, 0, 0.2)'
+            ))
+            fig.add_trace(go.Scatter(
+                x=time_axis(band), y=band['Projection_P50'],
+                name='Médiane de l\'ensemble',
+                line=dict(color='#FF8C00', width=2)
+            ))
+        
         # Projections futures
         if 'Future_Projection' in df.columns:
             future = df[df['Year'] >= 2020]
             fig.add_trace(go.Scatter(
-                x=future['Year'], y=future['Future_Projection'],
+                x=time_axis(future), y=future['Future_Projection'],
                 name='Projections futures',
                 line=dict(color='#FF8C00', width=3, dash='dash'),
                 opacity=0.8
             ))
         
-        fig.add_vline(x=2020, line_dash="dash", line_color="red", 
+        fig.add_vline(x=year_position(df, 2020), line_dash="dash", line_color="red", 
                      annotation_text="Début projections")
         
         fig.update_layout(
@@ -437,22 +867,27 @@ class EarthStreamlitDashboard:
             yaxis_title=analyzer.config["unit"]
         )
         
-        st.plotly_chart(fig, use_container_width=True)
+        self.show_figure('projections', cache_key, fig)
     
-    def plot_extreme_events(self, df, analyzer):
+    def plot_extreme_events(self, df, analyzer, cache_key=None):
         """Événements extrêmes"""
         st.subheader('Événements Climatiques Extrêmes')
+        if self.show_cached_figure('extreme_events', cache_key):
+            return
         
         # Identifier les événements extrêmes
         if 'Extreme_Events' in df.columns:
             threshold = df['Extreme_Events'].quantile(0.9)
-            extreme_df = df[df['Extreme_Events'] > threshold]
+            budget = CHART_POINT_BUDGETS["extreme_events"]
+            bars = downsample(df, 'Extreme_Events', budget, method='minmax')
+            extreme_df = downsample(df[df['Extreme_Events'] > threshold], 'Extreme_Events',
+                                    budget, method='minmax')
             
             fig = go.Figure()
             
-            # Tous les événements
+            # Tous les événements (extrêmes de chaque tranche au-delà du budget)
             fig.add_trace(go.Bar(
-                x=df['Year'], y=df['Extreme_Events'],
+                x=time_axis(bars), y=bars['Extreme_Events'],
                 name='Intensité des événements',
                 marker_color='lightgray',
                 opacity=0.5
@@ -460,7 +895,7 @@ class EarthStreamlitDashboard:
             
             # Événements extrêmes
             fig.add_trace(go.Bar(
-                x=extreme_df['Year'], y=extreme_df['Extreme_Events'],
+                x=time_axis(extreme_df), y=extreme_df['Extreme_Events'],
                 name='Événements extrêmes',
                 marker_color='#FF4500'
             ))
@@ -468,8 +903,9 @@ class EarthStreamlitDashboard:
         else:
             # Fallback
             fig = go.Figure()
+            base = downsample(df, 'Base_Value', CHART_POINT_BUDGETS["timeline"])
             fig.add_trace(go.Scatter(
-                x=df['Year'], y=df['Base_Value'],
+                x=time_axis(base), y=base['Base_Value'],
                 name='Données de base',
                 line=dict(color='#1E90FF', width=2)
             ))
@@ -482,64 +918,122 @@ class EarthStreamlitDashboard:
             yaxis_title='Intensité relative'
         )
         
-        st.plotly_chart(fig, use_container_width=True)
+        self.show_figure('extreme_events', cache_key, fig)
     
-    def plot_global_heatmap(self, analyzer):
+    def plot_global_heatmap(self, analyzer, year_range, cache_key=None):
         """Carte thermique globale"""
-        # Simuler des données spatiales
-        lat = np.linspace(-90, 90, 18)
-        lon = np.linspace(-180, 180, 36)
-        lat_grid, lon_grid = np.meshgrid(lat, lon)
-        
-        # Simulation de données
-        base_temp = analyzer.config["base_value"]
-        data = base_temp + 30 * np.sin(np.radians(lat_grid)) + np.random.normal(0, 5, lat_grid.shape)
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            year = st.slider("Année affichée:", min_value=year_range[0], max_value=year_range[1],
+                             value=year_range[1])
+        with col2:
+            grid_deg = st.selectbox("Résolution de la grille:", options=HEATMAP_GRIDS, index=1,
+                                    format_func=lambda deg: f"{deg:g}°")
+        
+        cache_key = cache_key + (grid_deg, year) if cache_key is not None else None
+        if self.show_cached_figure('heatmap', cache_key):
+            return
+        
+        with TIMER.stage('load_cube'):
+            cube = load_spatial_cube(analyzer.data_type, analyzer.seed, analyzer.start_year,
+                                     analyzer.end_year, analyzer.resolution, grid_deg)
+        if cube is None:
+            st.info("Carte indisponible avec la version simplifiée de EarthDataAnalyzer")
+            return
+        with TIMER.stage('year_field'):
+            lat, lon, data = cube.lat, cube.lon, cube.year_field(year)
         
         fig = go.Figure(data=go.Heatmap(
             z=data,
-            x=lon[::2],
-            y=lat[::2],
+            x=lon,
+            y=lat,
             colorscale='Viridis',
+            colorbar=dict(title=analyzer.config["unit"]),
             showscale=True
         ))
         
         fig.update_layout(
             height=400,
             template='plotly_white',
+            title=f"{analyzer.config['description']} - {year}",
             xaxis_title='Longitude',
             yaxis_title='Latitude'
         )
         
-        st.plotly_chart(fig, use_container_width=True)
+        self.show_figure('heatmap', cache_key, fig)
+    
+    def show_cached_figure(self, chart, cache_key):
+        """Affiche la figure depuis le cache si elle y est; retourne True dans ce cas"""
+        if cache_key is None:
+            return False
+        with TIMER.stage('figure_cache/get'):
+            spec = get_figure_cache().get(chart, cache_key)
+        if spec is None:
+            return False
+        with TIMER.stage('serialize'):
+            st.plotly_chart(spec, use_container_width=True)
+        return True
+    
+    def show_figure(self, chart, cache_key, fig):
+        """Affiche une figure construite et la mémorise dans le cache"""
+        if cache_key is not None:
+            with TIMER.stage('figure_cache/put'):
+                get_figure_cache().put(chart, cache_key, fig)
+        with TIMER.stage('serialize'):
+            st.plotly_chart(fig, use_container_width=True)
+    
+    def display_figure_cache_stats(self):
+        """Taux de succès du cache de figures, par graphique"""
+        cache = get_figure_cache()
+        with st.sidebar.expander("📈 Cache des graphiques"):
+            for chart, (hits, misses, rate) in cache.stats().items():
+                st.write(f"**{chart}**: {rate:.0%} ({hits} succès / {misses} échecs)")
+            st.caption(f"{len(cache.entries)} figures, {cache.size / 2 ** 20:.1f} Mo, "
+                       f"{cache.evictions} évictions")
+    
+    def display_timing_panel(self, stages):
+        """Durées par étape du dernier rerun et percentiles glissants (p50/p95)"""
+        rolling = TIMER.percentiles('dashboard')
+        total_p50, total_p95, reruns = rolling[()]
+        with st.sidebar.expander("⏱️ Performance", expanded=True):
+            # Sous-étapes indentées sous leur étape englobante
+            st.dataframe(pd.DataFrame({
+                'Étape': ['\u2003' * (len(path) - 1) + path[-1] for path, _ in stages],
+                'Dernier (ms)': [elapsed for _, elapsed in stages],
+                'p50 (ms)': [rolling[path][0] for path, _ in stages],
+                'p95 (ms)': [rolling[path][1] for path, _ in stages],
+            }).round(1), hide_index=True, use_container_width=True)
+            st.caption(f"Rerun complet: p50 {total_p50:.0f} ms, p95 {total_p95:.0f} ms "
+                       f"sur {reruns} reruns")
     
-    def display_insights(self, df, analyzer):
+    def display_insights(self, summary, analyzer):
         """Affiche les insights analytiques"""
         st.subheader("🎯 Insights et Analyses")
         
-        # Calculer les métriques
-        current_value = df['Base_Value'].iloc[-1]
-        total_change = ((df['Base_Value'].iloc[-1] / df['Base_Value'].iloc[0]) - 1) * 100
-        recent_change = ((df['Base_Value'].iloc[-1] / df[df['Year'] >= 2000]['Base_Value'].iloc[0]) - 1) * 100
-        current_risk = df['Risk_Level'].iloc[-1]
+        # Métriques précalculées
+        current_value = summary.current_value
+        total_change = summary.total_change
+        recent_change = summary.recent_change
+        current_risk = summary.current_risk
         
         col1, col2 = st.columns(2)
         
         with col1:
             st.markdown("### 📊 Points Clés")
             st.metric("Valeur Actuelle", f"{current_value:.1f} {analyzer.config['unit']}")
-            st.metric("Changement depuis 1850", f"{total_change:+.1f}%")
+            st.metric(f"Changement depuis {summary.start_year}", f"{total_change:+.1f}%")
             st.metric("Changement depuis 2000", f"{recent_change:+.1f}%")
             st.metric("Niveau de Risque Actuel", f"{current_risk:.0f}/100")
         
         with col2:
             st.markdown("### 🔍 Recommandations")
             
-            if current_risk > 70:
+            if summary.risk_class == 'high':
                 st.error("**Action Immédiate Requise** - Niveau de risque critique")
                 st.write("• Renforcement des mesures d'urgence")
                 st.write("• Surveillance accrue")
                 st.write("• Plan d'action immédiat")
-            elif current_risk > 40:
+            elif summary.risk_class == 'moderate':
                 st.warning("**Vigilance Renforcée** - Niveau de risque modéré")
                 st.write("• Surveillance continue")
                 st.write("• Planification d'actions préventives")
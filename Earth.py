@@ -1,14 +1,95 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from datetime import datetime, timedelta
-import warnings
-warnings.filterwarnings('ignore')
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from earth_events import CLIMATE_EVENTS
+from earth_smoothing import moving_average
+from earth_timing import TIMER
+
+# Types de données terrestres disponibles
+EARTH_DATA_TYPES = [
+    "temperature", "co2", "sea_level", "precipitation",
+    "glaciers", "biodiversity", "air_quality", "ocean_ph"
+]
 
 class EarthDataAnalyzer:
-    def __init__(self, data_type):
+    # Graphe des colonnes: méthode de simulation et colonnes intermédiaires requises
+    COLUMN_GRAPH = {
+        # Données principales basées sur les cycles climatiques
+        'Base_Value': ('_simulate_earth_cycle', ()),
+        'Seasonal_Min': ('_simulate_seasonal_minima', ()),
+        'Seasonal_Max': ('_simulate_seasonal_maxima', ()),
+        'Annual_Cycle': ('_simulate_annual_cycle', ()),
+        # Variations à long terme
+        'Climate_Trend': ('_simulate_climate_trend', ()),
+        'Extreme_Events': ('_simulate_extreme_events', ()),
+        'Human_Impact': ('_simulate_human_impact', ()),
+        # Données dérivées
+        'Smoothed_Value': ('_simulate_smoothed_data', ('Base_Value',)),
+        'Monthly_Variation': ('_simulate_monthly_variation', ()),
+        'Decadal_Variation': ('_simulate_decadal_variation', ()),
+        # Indices environnementaux complémentaires
+        'Environmental_Index': ('_simulate_environmental_index', ('Base_Value', 'Climate_Trend')),
+        'Risk_Level': ('_simulate_risk_level', ('Human_Impact', 'Extreme_Events')),
+        'Future_Projection': ('_simulate_future_projection', ('Base_Value', 'Climate_Trend')),
+    }
+    
+    # Version du générateur: à incrémenter dès que les valeurs simulées changent
+    # (invalide les jeux de données mis en cache sur disque)
+    GENERATOR_VERSION = 4
+    
+    # Taille des blocs de tirages aléatoires: chaque bloc de lignes d'une colonne
+    # possède son propre flux, indépendamment du découpage du calcul
+    RNG_BLOCK_ROWS = 4096
+    
+    # Résolutions temporelles: fréquence pandas et nombre moyen de pas par an
+    RESOLUTIONS = {
+        'annual': ('YE', 1),
+        'monthly': ('MS', 12),
+        'daily': ('D', 365.25),
+        'hourly': ('h', 8766),
+    }
+    
+    # Nombre de lignes par morceau pour la génération en flux (iter_earth_data)
+    CHUNK_ROWS = 32 * RNG_BLOCK_ROWS
+    
+    # Ensembles de projections: membres par flux aléatoire, et taille à partir de
+    # laquelle le calcul est réparti sur un pool de processus
+    ENSEMBLE_MEMBER_BLOCK = 256
+    ENSEMBLE_POOL_MIN_MEMBERS = 20000
+    
+    # Résolution par défaut (en degrés) de la grille spatiale lat x lon
+    SPATIAL_GRID_DEG = 5.0
+    
+    # Schéma des colonnes: types complets (par défaut) et compacts (compact=True).
+    # En mode compact, les colonnes à faible cardinalité sont stockées en catégories.
+    # CATEGORICAL_COLUMNS donne leur nombre maximal de valeurs distinctes ('phase':
+    # deux par pas de l'année, années bissextiles ou non); une colonne n'est
+    # catégorisée que si ce maximum, à la résolution choisie, ne dépasse pas
+    # CATEGORY_MAX: le type ne dépend jamais des valeurs tirées
+    VALUE_DTYPES = {False: np.float64, True: np.float32}
+    YEAR_DTYPES = {False: np.int64, True: np.int16}
+    CATEGORICAL_COLUMNS = {
+        'Seasonal_Min': 'phase',
+        'Seasonal_Max': 'phase',
+        'Annual_Cycle': 'phase',
+        'Monthly_Variation': 12,
+    }
+    CATEGORY_MAX = 256
+    
+    def __init__(self, data_type, seed=None, resolution='annual', compact=False):
+        if resolution not in self.RESOLUTIONS:
+            raise ValueError(f"Résolution inconnue: {resolution}")
         self.data_type = data_type
+        self.resolution = resolution
+        self.compact = compact
+        
+        # Graine propre à l'instance (tirée au hasard puis conservée si absente);
+        # tous les tirages passent par des flux dérivés de cette graine (_stream)
+        if seed is None:
+            seed = np.random.SeedSequence().entropy
+        self.seed = seed
         self.colors = ['#1E90FF', '#32CD32', '#FF4500', '#8A2BE2', '#FFD700', 
                       '#00CED1', '#FF6347', '#6A5ACD', '#2E8B57', '#DA70D6']
         
@@ -98,632 +179,576 @@ class EarthDataAnalyzer:
         
         return configs.get(self.data_type, configs["default"])
     
-    def generate_earth_data(self):
-        """Génère des données terrestres simulées basées sur les cycles climatiques réels"""
-        print(f"🌍 Génération des données terrestres pour {self.config['description']}...")
-        
-        # Créer une base de données annuelle
-        dates = pd.date_range(start=f'{self.start_year}-01-01', 
-                             end=f'{self.end_year}-12-31', freq='Y')
+    def generate_earth_data(self, columns=None):
+        """Génère des données terrestres simulées basées sur les cycles climatiques réels
         
-        data = {'Year': [date.year for date in dates]}
-        
-        # Données principales basées sur les cycles climatiques
-        data['Base_Value'] = self._simulate_earth_cycle(dates)
-        data['Seasonal_Min'] = self._simulate_seasonal_minima(dates)
-        data['Seasonal_Max'] = self._simulate_seasonal_maxima(dates)
-        data['Annual_Cycle'] = self._simulate_annual_cycle(dates)
-        
-        # Variations à long terme
-        data['Climate_Trend'] = self._simulate_climate_trend(dates)
-        data['Extreme_Events'] = self._simulate_extreme_events(dates)
-        data['Human_Impact'] = self._simulate_human_impact(dates)
-        
-        # Données dérivées
-        data['Smoothed_Value'] = self._simulate_smoothed_data(dates)
-        data['Monthly_Variation'] = self._simulate_monthly_variation(dates)
-        data['Decadal_Variation'] = self._simulate_decadal_variation(dates)
-        
-        # Indices environnementaux complémentaires
-        data['Environmental_Index'] = self._simulate_environmental_index(dates)
-        data['Risk_Level'] = self._simulate_risk_level(dates)
-        data['Future_Projection'] = self._simulate_future_projection(dates)
+        `columns` restreint le calcul aux colonnes demandées (et à leurs
+        dépendances); par défaut toutes les colonnes de COLUMN_GRAPH sont produites.
+        """
+        print(f"🌍 Génération des données terrestres pour {self.config['description']}...")
         
-        df = pd.DataFrame(data)
+        columns = self._check_columns(columns)
+        with TIMER.stage('generate'):
+            return self._build_frame(self._time_axis(), columns)
+    
+    def iter_earth_data(self, columns=None, chunk_rows=None):
+        """Génère les données par morceaux de `chunk_rows` lignes (DataFrames successifs)
+        
+        Destiné aux résolutions denses (journalière, horaire): la série complète
+        n'est jamais en mémoire. La concaténation des morceaux reproduit
+        generate_earth_data (Smoothed_Value aux arrondis flottants près, ~1e-13).
+        En mode compact, les morceaux restent en float32 sans catégories, dont
+        l'ensemble des valeurs n'est connu que sur la série complète.
+        """
+        print(f"🌍 Génération en flux des données terrestres pour {self.config['description']}...")
+        
+        columns = self._check_columns(columns)
+        chunk_rows = chunk_rows or self.CHUNK_ROWS
+        n_rows = self._n_rows()
+        for start in range(0, n_rows, chunk_rows):
+            yield self._build_frame(self._time_axis(start, start + chunk_rows), columns,
+                                    categorize=False)
+    
+    def schema(self, columns=None):
+        """Types des colonnes produites par generate_earth_data ({nom: dtype})"""
+        dtypes = {'Year': np.dtype(self.YEAR_DTYPES[self.compact])}
+        if self.resolution != 'annual':
+            dtypes['Date'] = self._time_axis(0, 1).dtype
+        for name in self._check_columns(columns):
+            if self._is_categorical(name):
+                dtypes[name] = 'category'
+            else:
+                dtypes[name] = np.dtype(self.VALUE_DTYPES[self.compact])
+        return dtypes
+    
+    def _check_columns(self, columns):
+        """Valide la liste des colonnes demandées (toutes par défaut)"""
+        if columns is None:
+            return list(self.COLUMN_GRAPH)
+        unknown = [name for name in columns if name not in self.COLUMN_GRAPH]
+        if unknown:
+            raise ValueError(f"Colonnes inconnues: {', '.join(unknown)}")
+        return list(columns)
+    
+    def _build_frame(self, dates, columns, categorize=True):
+        """Construit le DataFrame des colonnes demandées sur l'axe temporel `dates`"""
+        # Chaque intermédiaire n'est simulé qu'une fois et partagé entre colonnes
+        computed = self._compute_columns(dates, columns)
+        
+        # Bloc de valeurs préalloué au type du schéma (une ligne par colonne, comme
+        # le stockage interne de pandas) et rempli sur place, sans copie ensuite
+        with TIMER.stage('frame'):
+            values = np.empty((len(columns), len(dates)), dtype=self.VALUE_DTYPES[self.compact])
+            for i, name in enumerate(columns):
+                values[i] = computed[name]
+            df = pd.DataFrame(values.T, columns=columns, copy=False)
+            
+            if self.resolution != 'annual':
+                df.insert(0, 'Date', dates)
+            df.insert(0, 'Year', self._years(dates).astype(self.YEAR_DTYPES[self.compact]))
         
         # Ajouter des événements climatiques historiques
-        self._add_climate_events(df)
+        with TIMER.stage('events'):
+            self._add_climate_events(df)
         
+        if self.compact and categorize:
+            with TIMER.stage('categorize'):
+                self._categorize(df)
         return df
     
+    def _is_categorical(self, name):
+        """Vrai si la colonne est stockée en catégories (mode compact, cardinalité bornée)"""
+        if not self.compact or name not in self.CATEGORICAL_COLUMNS:
+            return False
+        cardinality = self.CATEGORICAL_COLUMNS[name]
+        if cardinality == 'phase':
+            cardinality = 2 * int(np.ceil(self.RESOLUTIONS[self.resolution][1]))
+        return cardinality <= self.CATEGORY_MAX
+    
+    def _categorize(self, df):
+        """Convertit en catégories les colonnes annoncées comme telles par schema()"""
+        for name in self.CATEGORICAL_COLUMNS:
+            if name in df.columns and self._is_categorical(name):
+                df[name] = pd.Categorical(df[name])
+    
+    def _compute_columns(self, dates, columns):
+        """Résout le graphe des colonnes en mémoïsant chaque intermédiaire"""
+        computed = {}
+        
+        def resolve(name):
+            if name not in computed:
+                method, dependencies = self.COLUMN_GRAPH[name]
+                inputs = [resolve(dependency) for dependency in dependencies]
+                with TIMER.stage(f'simulate/{name}'):
+                    computed[name] = getattr(self, method)(dates, *inputs)
+            return computed[name]
+        
+        for name in columns:
+            resolve(name)
+        return computed
+    
+    def _origin(self):
+        """Premier instant de la période simulée"""
+        return pd.Timestamp(year=self.start_year, month=1, day=1)
+    
+    def _n_rows(self):
+        """Nombre total de lignes de la série à la résolution choisie"""
+        n_years = self.end_year - self.start_year + 1
+        if self.resolution == 'annual':
+            return n_years
+        if self.resolution == 'monthly':
+            return 12 * n_years
+        n_days = (pd.Timestamp(year=self.end_year + 1, month=1, day=1) - self._origin()).days
+        return n_days if self.resolution == 'daily' else 24 * n_days
+    
+    def _row_timestamp(self, row):
+        """Horodatage de la ligne `row` de la série complète"""
+        if self.resolution == 'annual':
+            return pd.Timestamp(year=self.start_year + row, month=12, day=31)
+        if self.resolution == 'monthly':
+            return pd.Timestamp(year=self.start_year + row // 12, month=row % 12 + 1, day=1)
+        unit = 'D' if self.resolution == 'daily' else 'h'
+        return self._origin() + pd.Timedelta(row, unit=unit)
+    
+    def _time_axis(self, start_row=0, stop_row=None):
+        """Axe temporel des lignes [start_row, stop_row) de la série complète"""
+        n_rows = self._n_rows()
+        stop_row = n_rows if stop_row is None else min(stop_row, n_rows)
+        freq = self.RESOLUTIONS[self.resolution][0]
+        return pd.date_range(start=self._row_timestamp(start_row),
+                             periods=max(0, stop_row - start_row), freq=freq)
+    
+    def _years(self, dates):
+        """Retourne les années de l'axe temporel sous forme de tableau NumPy"""
+        return np.asarray(dates.year, dtype=np.int64)
+    
+    def _year_phase(self, dates):
+        """Phase dans l'année (0-1) de chaque pas de temps (0 en résolution annuelle)"""
+        if self.resolution == 'annual':
+            return np.zeros(len(dates))
+        days_in_year = np.where(dates.is_leap_year, 366.0, 365.0)
+        return (np.asarray(dates.dayofyear) - 1 + np.asarray(dates.hour) / 24) / days_in_year
+    
+    def _time(self, dates):
+        """Temps continu en années décimales (année + phase intra-annuelle)"""
+        return self._years(dates) + self._year_phase(dates)
+    
+    def _year_start_row(self, year):
+        """Première ligne de l'année `year` dans la série complète"""
+        year = min(max(year, self.start_year), self.end_year + 1)
+        if self.resolution == 'annual':
+            return year - self.start_year
+        if self.resolution == 'monthly':
+            return 12 * (year - self.start_year)
+        n_days = (pd.Timestamp(year=year, month=1, day=1) - self._origin()).days
+        return n_days if self.resolution == 'daily' else 24 * n_days
+    
+    def _row_span(self, dates):
+        """Positions [début, fin) de l'axe temporel dans la série complète"""
+        if not len(dates):
+            return 0, 0
+        first = dates[0]
+        if self.resolution == 'annual':
+            start = first.year - self.start_year
+        elif self.resolution == 'monthly':
+            start = 12 * (first.year - self.start_year) + first.month - 1
+        else:
+            unit = 'D' if self.resolution == 'daily' else 'h'
+            start = int((first - self._origin()) // pd.Timedelta(1, unit=unit))
+        return start, start + len(dates)
+    
+    def _stream(self, column, block):
+        """Générateur dédié à un bloc de lignes d'une colonne (Philox + SeedSequence)
+        
+        Le type de données fait partie de la clé: des analyseurs de types
+        différents partageant une graine tirent des bruits indépendants.
+        """
+        type_key = zlib.crc32(self.data_type.encode('utf-8'))
+        key = zlib.crc32(column.encode('utf-8'))
+        sequence = np.random.SeedSequence(self.seed, spawn_key=(type_key, key, block))
+        return np.random.Generator(np.random.Philox(sequence))
+    
+    def _draw(self, column, dates, method='standard_normal'):
+        """Tirages aléatoires d'une colonne pour les lignes couvertes par `dates`
+        
+        Les tirages sont indexés par position absolue de ligne: générer une
+        période d'un bloc ou la découper entre threads/processus donne des
+        valeurs identiques au bit près.
+        """
+        start, stop = self._row_span(dates)
+        if stop <= start:
+            return np.empty(0)
+        
+        block_rows = self.RNG_BLOCK_ROWS
+        first, last = start // block_rows, (stop - 1) // block_rows
+        draws = np.concatenate([getattr(self._stream(column, block), method)(block_rows)
+                                for block in range(first, last + 1)])
+        offset = first * block_rows
+        return draws[start - offset:stop - offset]
+    
+    def _trend_factor(self, years):
+        """Facteur de tendance long terme selon le type de données"""
+        if self.config["trend"] == "croissante":
+            return 1 + 0.01 * (years - 1850) / 100
+        elif self.config["trend"] == "décroissante":
+            return 1 - 0.01 * (years - 1850) / 100
+        return np.ones(len(years))
+    
     def _simulate_earth_cycle(self, dates):
         """Simule le cycle climatique principal"""
         base_value = self.config["base_value"]
         cycle_years = self.config["cycle_years"]
         amplitude = self.config["amplitude"]
+        years = self._years(dates)
         
-        values = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Cycle annuel de base
-            annual_cycle = np.sin(2 * np.pi * (year - self.start_year) / cycle_years)
-            
-            # Ajustement pour différents types de données
-            if self.config["trend"] == "croissante":
-                trend_factor = 1 + 0.01 * (year - 1850) / 100
-            elif self.config["trend"] == "décroissante":
-                trend_factor = 1 - 0.01 * (year - 1850) / 100
-            else:
-                trend_factor = 1.0
-            
-            value = base_value * trend_factor + amplitude * annual_cycle
-            
-            # Bruit naturel
-            noise = np.random.normal(0, amplitude * 0.05)
-            values.append(value + noise)
+        # Cycle annuel de base (continu à l'intérieur de l'année)
+        annual_cycle = np.sin(2 * np.pi * (self._time(dates) - self.start_year) / cycle_years)
+        
+        # Ajustement pour différents types de données
+        values = base_value * self._trend_factor(years) + amplitude * annual_cycle
         
-        return values
+        # Bruit naturel (tiré en une seule fois pour toute la série)
+        noise = amplitude * 0.05 * self._draw('Base_Value', dates)
+        return values + noise
     
     def _simulate_seasonal_minima(self, dates):
         """Simule les périodes de minimum saisonnier"""
-        minima = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Variation saisonnière
-            seasonal_phase = (year - self.start_year) % 1.0
-            
-            if self.data_type == "temperature":
-                # Minimum en hiver
-                if seasonal_phase < 0.25 or seasonal_phase > 0.75:
-                    min_factor = 0.7
-                else:
-                    min_factor = 1.0
-            else:
-                min_factor = 0.8 + 0.2 * np.sin(2 * np.pi * seasonal_phase)
-            
-            minima.append(min_factor)
+        # Variation saisonnière
+        seasonal_phase = self._year_phase(dates)
         
-        return minima
+        if self.data_type == "temperature":
+            # Minimum en hiver
+            winter = (seasonal_phase < 0.25) | (seasonal_phase > 0.75)
+            return np.where(winter, 0.7, 1.0)
+        return 0.8 + 0.2 * np.sin(2 * np.pi * seasonal_phase)
     
     def _simulate_seasonal_maxima(self, dates):
         """Simule les périodes de maximum saisonnier"""
-        maxima = []
-        for i, date in enumerate(dates):
-            year = date.year
-            seasonal_phase = (year - self.start_year) % 1.0
-            
-            if self.data_type == "temperature":
-                # Maximum en été
-                if 0.25 <= seasonal_phase <= 0.75:
-                    max_factor = 1.0
-                else:
-                    max_factor = 0.8
-            else:
-                max_factor = 1.0 + 0.2 * np.sin(2 * np.pi * seasonal_phase)
-            
-            maxima.append(max_factor)
+        seasonal_phase = self._year_phase(dates)
         
-        return maxima
+        if self.data_type == "temperature":
+            # Maximum en été
+            summer = (seasonal_phase >= 0.25) & (seasonal_phase <= 0.75)
+            return np.where(summer, 1.0, 0.8)
+        return 1.0 + 0.2 * np.sin(2 * np.pi * seasonal_phase)
     
     def _simulate_annual_cycle(self, dates):
         """Simule le cycle annuel (0-1)"""
-        cycles = []
-        for date in dates:
-            year = date.year
-            cycle = (year - self.start_year) % 1.0
-            cycles.append(cycle)
-        
-        return cycles
+        return self._year_phase(dates)
     
     def _simulate_climate_trend(self, dates):
         """Simule les tendances climatiques à long terme"""
-        trends = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Tendance climatique basée sur l'ère industrielle
-            if year < 1900:
-                trend = 1.0  # Période pré-industrielle
-            elif 1900 <= year < 1950:
-                trend = 1.0 + 0.002 * (year - 1900)  # Début industrialisation
-            elif 1950 <= year < 1980:
-                trend = 1.02 + 0.005 * (year - 1950)  # Accélération
-            elif 1980 <= year < 2000:
-                trend = 1.1 + 0.01 * (year - 1980)  # Période moderne
-            else:
-                trend = 1.3 + 0.015 * (year - 2000)  # Période contemporaine
-            
-            trends.append(trend)
-        
-        return trends
+        years = self._years(dates)
+        
+        # Tendance climatique basée sur l'ère industrielle
+        eras = [
+            years < 1900,   # Période pré-industrielle
+            years < 1950,   # Début industrialisation
+            years < 1980,   # Accélération
+            years < 2000,   # Période moderne
+        ]
+        trends = [
+            np.ones(len(years)),
+            1.0 + 0.002 * (years - 1900),
+            1.02 + 0.005 * (years - 1950),
+            1.1 + 0.01 * (years - 1980),
+        ]
+        # Période contemporaine
+        return np.select(eras, trends, default=1.3 + 0.015 * (years - 2000))
     
     def _simulate_extreme_events(self, dates):
         """Simule les événements climatiques extrêmes"""
-        extremes = []
-        for date in dates:
-            year = date.year
-            
-            # Augmentation des événements extrêmes avec le temps
-            base_prob = 0.1
-            time_factor = 0.001 * (year - 1850)
-            extreme_prob = min(0.8, base_prob + time_factor)
-            
-            # Simulation d'événement extrême
-            if np.random.random() < extreme_prob:
-                intensity = 1.0 + 0.5 * (year - 1850) / 100
-            else:
-                intensity = 1.0
-            
-            extremes.append(intensity)
+        years = self._years(dates)
         
-        return extremes
+        # Augmentation des événements extrêmes avec le temps
+        base_prob = 0.1
+        time_factor = 0.001 * (years - 1850)
+        extreme_prob = np.minimum(0.8, base_prob + time_factor)
+        
+        # Simulation d'événement extrême
+        occurred = self._draw('Extreme_Events', dates, 'random') < extreme_prob
+        return np.where(occurred, 1.0 + 0.5 * (years - 1850) / 100, 1.0)
     
     def _simulate_human_impact(self, dates):
         """Simule l'impact des activités humaines"""
-        impacts = []
-        for date in dates:
-            year = date.year
-            
-            # Impact croissant des activités humaines
-            if year < 1800:
-                impact = 1.0  # Impact négligeable
-            elif 1800 <= year < 1900:
-                impact = 1.0 + 0.005 * (year - 1800)  # Révolution industrielle
-            elif 1900 <= year < 1950:
-                impact = 1.5 + 0.01 * (year - 1900)  # Industrialisation
-            elif 1950 <= year < 1980:
-                impact = 2.0 + 0.02 * (year - 1950)  # Expansion
-            elif 1980 <= year < 2000:
-                impact = 2.6 + 0.03 * (year - 1980)  # Mondialisation
-            else:
-                impact = 3.2 + 0.04 * (year - 2000)  # Période actuelle
-            
-            impacts.append(impact)
-        
-        return impacts
-    
-    def _simulate_smoothed_data(self, dates):
+        years = self._years(dates)
+        
+        # Impact croissant des activités humaines
+        eras = [
+            years < 1800,   # Impact négligeable
+            years < 1900,   # Révolution industrielle
+            years < 1950,   # Industrialisation
+            years < 1980,   # Expansion
+            years < 2000,   # Mondialisation
+        ]
+        impacts = [
+            np.ones(len(years)),
+            1.0 + 0.005 * (years - 1800),
+            1.5 + 0.01 * (years - 1900),
+            2.0 + 0.02 * (years - 1950),
+            2.6 + 0.03 * (years - 1980),
+        ]
+        # Période actuelle
+        return np.select(eras, impacts, default=3.2 + 0.04 * (years - 2000))
+    
+    def _simulate_smoothed_data(self, dates, base_cycle=None):
         """Simule des données lissées (moyenne mobile sur 10 ans)"""
-        base_cycle = self._simulate_earth_cycle(dates)
+        half_window = int(round(5 * self.RESOLUTIONS[self.resolution][1]))
         
-        smoothed = []
-        for i in range(len(base_cycle)):
-            # Moyenne mobile centrée sur 10 ans
-            start_idx = max(0, i - 5)
-            end_idx = min(len(base_cycle), i + 5)
-            window = base_cycle[start_idx:end_idx]
-            smoothed.append(np.mean(window))
+        # La fenêtre déborde du morceau demandé: on simule aussi les lignes voisines
+        start, stop = self._row_span(dates)
+        lo, hi = max(0, start - half_window), min(self._n_rows(), stop + half_window)
+        if base_cycle is None or (lo, hi) != (start, stop):
+            base_cycle = self._simulate_earth_cycle(self._time_axis(lo, hi))
         
-        return smoothed
+        # Moyenne mobile centrée [i - 5 ans, i + 5 ans], tronquée aux bords de la série
+        smoothed = moving_average(base_cycle, 2 * half_window + 1, min_periods=1)
+        return smoothed[start - lo:stop - lo]
     
     def _simulate_monthly_variation(self, dates):
         """Simule les variations mensuelles"""
-        variations = []
-        for date in dates:
-            # Variation saisonnière
-            month = date.month
-            seasonal_variation = 0.1 * np.sin(2 * np.pi * (month - 1) / 12)
-            variations.append(1 + seasonal_variation)
-        
-        return variations
+        # Variation saisonnière
+        month = np.asarray(dates.month)
+        return 1 + 0.1 * np.sin(2 * np.pi * (month - 1) / 12)
     
     def _simulate_decadal_variation(self, dates):
         """Simule les variations décennales"""
-        variations = []
-        for i, date in enumerate(dates):
-            year = date.year
-            # Variation décennale
-            decadal_variation = 0.05 * np.sin(2 * np.pi * (year - self.start_year) / 10)
-            variations.append(1 + decadal_variation)
-        
-        return variations
+        return 1 + 0.05 * np.sin(2 * np.pi * (self._time(dates) - self.start_year) / 10)
     
-    def _simulate_environmental_index(self, dates):
+    def _simulate_environmental_index(self, dates, base_cycle=None, climate_trend=None):
         """Simule un indice environnemental composite"""
-        indices = []
-        base_cycle = self._simulate_earth_cycle(dates)
-        climate_trend = self._simulate_climate_trend(dates)
+        if base_cycle is None:
+            base_cycle = self._simulate_earth_cycle(dates)
+        if climate_trend is None:
+            climate_trend = self._simulate_climate_trend(dates)
         
-        for i in range(len(dates)):
-            # Indice composite pondéré
-            index = (base_cycle[i] * 0.6 + 
-                    climate_trend[i] * self.config["base_value"] * 0.4)
-            indices.append(index)
-        
-        return indices
+        # Indice composite pondéré
+        return base_cycle * 0.6 + climate_trend * self.config["base_value"] * 0.4
     
-    def _simulate_risk_level(self, dates):
+    def _simulate_risk_level(self, dates, human_impact=None, extreme_events=None):
         """Simule le niveau de risque environnemental (0-100)"""
-        risk_levels = []
-        human_impact = self._simulate_human_impact(dates)
-        extreme_events = self._simulate_extreme_events(dates)
-        
-        for i in range(len(dates)):
-            # Calcul du risque basé sur l'impact humain et les événements extrêmes
-            risk = min(100, human_impact[i] * 20 + (extreme_events[i] - 1) * 50)
-            risk_levels.append(risk)
+        if human_impact is None:
+            human_impact = self._simulate_human_impact(dates)
+        if extreme_events is None:
+            extreme_events = self._simulate_extreme_events(dates)
         
-        return risk_levels
+        # Calcul du risque basé sur l'impact humain et les événements extrêmes
+        return np.minimum(100, human_impact * 20 + (extreme_events - 1) * 50)
     
-    def _simulate_future_projection(self, dates):
+    def _simulate_future_projection(self, dates, base_cycle=None, climate_trend=None):
         """Simule des projections futures"""
-        projections = []
-        base_cycle = self._simulate_earth_cycle(dates)
-        climate_trend = self._simulate_climate_trend(dates)
+        years = self._years(dates)
+        if base_cycle is None:
+            base_cycle = self._simulate_earth_cycle(dates)
+        if climate_trend is None:
+            climate_trend = self._simulate_climate_trend(dates)
         
-        for i, date in enumerate(dates):
-            year = date.year
-            current_value = base_cycle[i]
-            trend_factor = climate_trend[i]
-            
-            if year > 2020:  # Période de projection
-                # Ajouter une incertitude croissante
-                years_since_2020 = year - 2020
-                uncertainty = 0.03 * years_since_2020
-                
-                if self.config["trend"] == "croissante":
-                    projection = current_value * trend_factor * (1 + np.random.normal(0.02, uncertainty))
-                elif self.config["trend"] == "décroissante":
-                    projection = current_value * trend_factor * (1 - np.random.normal(0.01, uncertainty))
-                else:
-                    projection = current_value * (1 + np.random.normal(0, uncertainty))
-            else:
-                projection = current_value
-            
-            projections.append(projection)
+        projections = base_cycle.copy()
+        
+        # Période de projection
+        future = years > 2020
+        if not future.any():
+            return projections
+        
+        # Ajouter une incertitude croissante
+        uncertainty = 0.03 * (years[future] - 2020)
+        shocks = uncertainty * self._draw('Future_Projection', dates)[future]
+        projections[future] = self._project(base_cycle[future], climate_trend[future], shocks)
         
         return projections
     
+    def _project(self, current_value, trend_factor, shocks):
+        """Applique la tendance et les chocs aléatoires aux valeurs projetées"""
+        if self.config["trend"] == "croissante":
+            return current_value * trend_factor * (1 + 0.02 + shocks)
+        elif self.config["trend"] == "décroissante":
+            return current_value * trend_factor * (1 - 0.01 - shocks)
+        return current_value * (1 + shocks)
+    
+    def generate_projection_ensemble(self, members=1000, percentiles=(5, 50, 95), workers=None):
+        """Génère un ensemble Monte Carlo de projections et en retourne les percentiles
+        
+        Les trajectoires sont calculées en un seul tableau (membres x années
+        projetées). Au-delà de ENSEMBLE_POOL_MIN_MEMBERS membres (ou si `workers`
+        est fourni), les membres sont répartis entre processus; chaque membre
+        ayant son propre flux aléatoire, le résultat ne dépend pas du découpage.
+        Retourne un DataFrame avec une colonne `Projection_P<p>` par percentile.
+        """
+        print(f"🎲 Ensemble de {members} projections pour {self.config['description']}...")
+        
+        dates = self._time_axis()
+        data = {'Year': self._years(dates).astype(self.YEAR_DTYPES[self.compact])}
+        if self.resolution != 'annual':
+            data['Date'] = dates
+        
+        # Avant 2021, toutes les trajectoires suivent les données simulées, événements
+        # climatiques compris (la Base_Value affichée sous les bandes)
+        history = self._build_frame(dates, ['Base_Value'], categorize=False)['Base_Value'].to_numpy()
+        first_row = self._year_start_row(2021)
+        
+        if workers is None:
+            workers = os.cpu_count() if members >= self.ENSEMBLE_POOL_MIN_MEMBERS else 1
+        with TIMER.stage('ensemble/paths'):
+            paths = self._projection_paths(members, workers)
+        
+        with TIMER.stage('ensemble/percentiles'):
+            bands = np.percentile(paths, percentiles, axis=0) if paths.shape[1] else None
+        for i, p in enumerate(percentiles):
+            band = history.astype(self.VALUE_DTYPES[self.compact])
+            if bands is not None:
+                band[first_row:] = bands[i]
+            data[f'Projection_P{p}'] = band
+        
+        return pd.DataFrame(data)
+    
+    def _projection_paths(self, members, workers):
+        """Trajectoires projetées (membres x années projetées), réparties entre processus"""
+        if workers <= 1:
+            return self._projection_members(0, members)
+        
+        # Découpage aligné sur les blocs de membres (un flux aléatoire par bloc)
+        block = self.ENSEMBLE_MEMBER_BLOCK
+        n_blocks = -(-members // block)
+        per_shard = -(-n_blocks // workers) * block
+        shards = [(self.data_type, self.seed, self.resolution, self.compact, self.start_year,
+                   self.end_year, first, min(first + per_shard, members))
+                  for first in range(0, members, per_shard)]
+        with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+            return np.concatenate(list(pool.map(_projection_shard, shards)))
+    
+    def _projection_members(self, first_member, stop_member):
+        """Trajectoires projetées des membres [first_member, stop_member)"""
+        dates = self._time_axis(self._year_start_row(2021))
+        years = self._years(dates)
+        # Trajectoires ancrées sur la Base_Value publiée (événements climatiques appliqués)
+        base_value = self._build_frame(dates, ['Base_Value'], categorize=False)['Base_Value'].to_numpy()
+        climate_trend = self._simulate_climate_trend(dates)
+        
+        uncertainty = 0.03 * (years - 2020)
+        shocks = uncertainty * self._member_draws(first_member, stop_member, len(dates))
+        paths = self._project(base_value.astype(np.float64), climate_trend, shocks)
+        return paths.astype(self.VALUE_DTYPES[self.compact], copy=False)
+    
+    def _member_draws(self, first_member, stop_member, n_rows):
+        """Tirages gaussiens (membres x lignes), un flux par bloc de membres"""
+        block = self.ENSEMBLE_MEMBER_BLOCK
+        first, last = first_member // block, (stop_member - 1) // block
+        if stop_member <= first_member:
+            return np.empty((0, n_rows))
+        draws = np.concatenate([self._stream('Future_Projection_ensemble', b).standard_normal((block, n_rows))
+                                for b in range(first, last + 1)])
+        offset = first * block
+        return draws[first_member - offset:stop_member - offset]
+    
+    def spatial_grid(self, grid_deg=None):
+        """Centres des mailles (latitudes, longitudes) d'une grille régulière"""
+        grid_deg = grid_deg or self.SPATIAL_GRID_DEG
+        lat = np.arange(-90 + grid_deg / 2, 90, grid_deg)
+        lon = np.arange(-180 + grid_deg / 2, 180, grid_deg)
+        return lat, lon
+    
+    def generate_spatial_cube(self, grid_deg=None, start_row=0, stop_row=None):
+        """Génère un cube spatio-temporel (temps, lat, lon) cohérent avec la série globale
+        
+        La moyenne pondérée par l'aire (cos lat) de chaque pas de temps est égale
+        à Base_Value. Retourne (dates, lat, lon, cube) avec un cube en float32.
+        """
+        dates = self._time_axis(start_row, stop_row)
+        lat, lon = self.spatial_grid(grid_deg)
+        cube = np.empty((len(dates), len(lat), len(lon)), dtype=np.float32)
+        self._fill_spatial(cube, dates, lat, lon)
+        return dates, lat, lon, cube
+    
+    def _fill_spatial(self, out, dates, lat, lon):
+        """Remplit `out` (temps, lat, lon) pour l'axe temporel `dates`"""
+        global_values = self._build_frame(dates, ['Base_Value'])['Base_Value'].to_numpy()
+        reference = self.config["base_value"]
+        amplitude = self.config["amplitude"]
+        
+        # Poids d'aire par latitude (les longitudes ont toutes le même poids)
+        lat_rad, lon_rad = np.radians(lat), np.radians(lon)
+        weights = np.cos(lat_rad) / np.cos(lat_rad).sum()
+        
+        # Amplification polaire des anomalies, de moyenne pondérée égale à 1
+        sin2 = np.sin(lat_rad) ** 2
+        amplification = (1 + 0.5 * (sin2 - weights @ sin2))[:, None]
+        
+        # Structure spatiale fixe: gradient équateur-pôles et onde zonale, de moyenne nulle
+        meridional = amplitude * np.cos(lat_rad) ** 2
+        pattern = ((meridional - weights @ meridional)[:, None]
+                   + 0.2 * amplitude * np.cos(lat_rad)[:, None] * np.sin(lon_rad)[None, :])
+        
+        # Bruit spatial: un flux par pas de temps, recentré pour préserver la moyenne globale
+        start, _ = self._row_span(dates)
+        stream_name = f'Spatial_{len(lat)}x{len(lon)}'
+        for i in range(len(dates)):
+            noise = self._stream(stream_name, start + i).standard_normal(pattern.shape, dtype=np.float32)
+            noise *= 0.1 * amplitude
+            noise -= weights @ noise.mean(axis=1)
+            out[i] = reference + (global_values[i] - reference) * amplification + pattern + noise
+        return out
+    
     def _add_climate_events(self, df):
         """Ajoute des événements climatiques historiques significatifs"""
-        for i, row in df.iterrows():
-            year = row['Year']
-            
-            # Événements climatiques historiques
-            if 1815 <= year <= 1816:
-                # Éruption du Tambora - année sans été
-                df.loc[i, 'Base_Value'] *= 0.9
-                df.loc[i, 'Risk_Level'] *= 1.2
-            
-            elif 1930 <= year <= 1939:
-                # Dust Bowl - sécheresse extrême
-                if self.data_type in ["temperature", "precipitation"]:
-                    df.loc[i, 'Base_Value'] *= 1.1
-                    df.loc[i, 'Risk_Level'] *= 1.3
-            
-            elif 1982 <= year <= 1983:
-                # El Niño majeur
-                df.loc[i, 'Base_Value'] *= 1.05
-                df.loc[i, 'Extreme_Events'] *= 1.5
-            
-            elif 1997 <= year <= 1998:
-                # El Niño record
-                df.loc[i, 'Base_Value'] *= 1.08
-                df.loc[i, 'Extreme_Events'] *= 1.8
-            
-            elif 2003:
-                # Canicule européenne
-                if self.data_type == "temperature":
-                    df.loc[i, 'Base_Value'] *= 1.1
-                    df.loc[i, 'Risk_Level'] = min(100, df.loc[i, 'Risk_Level'] * 1.4)
-            
-            elif 2005:
-                # Ouragan Katrina
-                df.loc[i, 'Extreme_Events'] *= 1.6
-            
-            elif 2011:
-                # Sécheresse du Texas + Fukushima
-                df.loc[i, 'Risk_Level'] *= 1.3
-            
-            elif 2019:
-                # Incendies en Australie
-                if self.data_type in ["temperature", "air_quality"]:
-                    df.loc[i, 'Base_Value'] *= 1.05
-                    df.loc[i, 'Risk_Level'] *= 1.2
-            
-            elif 2020:
-                # Année record de températures
-                if self.data_type == "temperature":
-                    df.loc[i, 'Base_Value'] *= 1.02
-    
-    def create_earth_analysis(self, df):
-        """Crée une analyse complète des données terrestres"""
-        plt.style.use('seaborn-v0_8')  # Style clair pour les données terrestres
-        fig = plt.figure(figsize=(20, 28))
-        
-        # 1. Données principales
-        ax1 = plt.subplot(5, 2, 1)
-        self._plot_primary_data(df, ax1)
-        
-        # 2. Tendances climatiques
-        ax2 = plt.subplot(5, 2, 2)
-        self._plot_climate_trends(df, ax2)
-        
-        # 3. Variations saisonnières
-        ax3 = plt.subplot(5, 2, 3)
-        self._plot_seasonal_variations(df, ax3)
-        
-        # 4. Impact humain
-        ax4 = plt.subplot(5, 2, 4)
-        self._plot_human_impact(df, ax4)
-        
-        # 5. Cycle annuel
-        ax5 = plt.subplot(5, 2, 5)
-        self._plot_annual_cycle(df, ax5)
-        
-        # 6. Données lissées
-        ax6 = plt.subplot(5, 2, 6)
-        self._plot_smoothed_data_plot(df, ax6)
-        
-        # 7. Niveau de risque
-        ax7 = plt.subplot(5, 2, 7)
-        self._plot_risk_level(df, ax7)
-        
-        # 8. Événements extrêmes
-        ax8 = plt.subplot(5, 2, 8)
-        self._plot_extreme_events(df, ax8)
-        
-        # 9. Indice environnemental
-        ax9 = plt.subplot(5, 2, 9)
-        self._plot_environmental_index(df, ax9)
-        
-        # 10. Projections futures
-        ax10 = plt.subplot(5, 2, 10)
-        self._plot_future_projections(df, ax10)
-        
-        plt.suptitle(f'Analyse des Données Terrestres: {self.config["description"]} ({self.start_year}-{self.end_year})', 
-                    fontsize=16, fontweight='bold', color='darkblue')
-        plt.tight_layout()
-        plt.savefig(f'earth_{self.data_type}_analysis.png', dpi=300, bbox_inches='tight', 
-                   facecolor='white', edgecolor='none')
-        plt.show()
-        
-        # Générer les insights
-        self._generate_earth_insights(df)
-    
-    def _plot_primary_data(self, df, ax):
-        """Plot des données principales"""
-        ax.plot(df['Year'], df['Base_Value'], label='Valeur observée', 
-               linewidth=2, color='#1E90FF', alpha=0.9)
-        
-        ax.set_title(f'Données Principales - {self.config["description"]}', 
-                    fontsize=12, fontweight='bold', color='darkblue')
-        ax.set_ylabel(self.config["unit"], color='#1E90FF')
-        ax.tick_params(axis='y', labelcolor='#1E90FF')
-        ax.grid(True, alpha=0.3, color='gray')
-        ax.set_facecolor('lightcyan')
-        
-        # Ajouter des annotations pour les décennies
-        for year in range(1850, 2026, 10):
-            if year in df['Year'].values:
-                ax.axvline(x=year, alpha=0.2, color='blue', linestyle='--')
-    
-    def _plot_climate_trends(self, df, ax):
-        """Plot des tendances climatiques"""
-        ax.plot(df['Year'], df['Climate_Trend'], label='Tendance climatique', 
-               linewidth=2, color='#FF4500')
-        ax.plot(df['Year'], df['Human_Impact'], label='Impact humain', 
-               linewidth=2, color='#8A2BE2')
-        
-        ax.set_title('Tendances Climatiques et Impact Humain', fontsize=12, fontweight='bold', color='darkblue')
-        ax.set_ylabel('Facteur multiplicatif', color='darkblue')
-        ax.legend()
-        ax.grid(True, alpha=0.3, color='gray')
-        ax.set_facecolor('lightcyan')
-        ax.tick_params(colors='darkblue')
-    
-    def _plot_seasonal_variations(self, df, ax):
-        """Plot des variations saisonnières"""
-        ax.plot(df['Year'], df['Seasonal_Min'], label='Minimum saisonnier', 
-               color='#1E90FF', alpha=0.7)
-        ax.plot(df['Year'], df['Seasonal_Max'], label='Maximum saisonnier', 
-               color='#FF6347', alpha=0.7)
-        
-        ax.set_title('Variations Saisonnières', fontsize=12, fontweight='bold', color='darkblue')
-        ax.set_ylabel('Facteur d\'amplitude', color='darkblue')
-        ax.legend()
-        ax.grid(True, alpha=0.3, color='gray')
-        ax.set_facecolor('lightcyan')
-        ax.tick_params(colors='darkblue')
-    
-    def _plot_human_impact(self, df, ax):
-        """Plot de l'impact humain"""
-        ax.fill_between(df['Year'], df['Human_Impact'], alpha=0.6, 
-                       color='#8A2BE2', label='Impact humain')
-        
-        ax.set_title('Impact des Activités Humaines', fontsize=12, fontweight='bold', color='darkblue')
-        ax.set_ylabel('Niveau d\'impact', color='darkblue')
-        ax.grid(True, alpha=0.3, color='gray')
-        ax.set_facecolor('lightcyan')
-        ax.tick_params(colors='darkblue')
-    
-    def _plot_annual_cycle(self, df, ax):
-        """Plot du cycle annuel"""
-        scatter = ax.scatter(df['Year'], df['Annual_Cycle'], c=df['Annual_Cycle'], 
-                           cmap='viridis', alpha=0.7, s=30)
-        
-        ax.set_title('Cycle Annuel (0-1)', fontsize=12, fontweight='bold', color='darkblue')
-        ax.set_ylabel('Phase du cycle', color='darkblue')
-        ax.set_xlabel('Année', color='darkblue')
-        plt.colorbar(scatter, ax=ax, label='Phase annuelle')
-        ax.grid(True, alpha=0.3, color='gray')
-        ax.set_facecolor('lightcyan')
-        ax.tick_params(colors='darkblue')
-    
-    def _plot_smoothed_data_plot(self, df, ax):
-        """Plot des données lissées"""
-        ax.plot(df['Year'], df['Base_Value'], label='Données brutes', 
-               alpha=0.5, color='#1E90FF')
-        ax.plot(df['Year'], df['Smoothed_Value'], label='Données lissées (10 ans)', 
-               linewidth=2, color='#32CD32')
-        
-        ax.set_title('Données Brutes vs Lissées', fontsize=12, fontweight='bold', color='darkblue')
-        ax.set_ylabel(self.config["unit"], color='darkblue')
-        ax.legend()
-        ax.grid(True, alpha=0.3, color='gray')
-        ax.set_facecolor('lightcyan')
-        ax.tick_params(colors='darkblue')
-    
-    def _plot_risk_level(self, df, ax):
-        """Plot du niveau de risque environnemental"""
-        ax.fill_between(df['Year'], df['Risk_Level'], alpha=0.6, 
-                       color='#FF4500', label='Niveau de risque')
-        ax.plot(df['Year'], df['Risk_Level'], color='#8B0000', alpha=0.8)
-        
-        ax.set_title('Niveau de Risque Environnemental (0-100)', fontsize=12, fontweight='bold', color='darkblue')
-        ax.set_ylabel('Niveau de risque', color='darkblue')
-        ax.set_ylim(0, 100)
-        ax.grid(True, alpha=0.3, color='gray')
-        ax.set_facecolor('lightcyan')
-        ax.tick_params(colors='darkblue')
-    
-    def _plot_extreme_events(self, df, ax):
-        """Plot des événements extrêmes"""
-        ax.bar(df['Year'], df['Extreme_Events'], alpha=0.6, 
-              color='#FF6347', label='Intensité des événements extrêmes')
-        
-        ax.set_title('Événements Climatiques Extrêmes', fontsize=12, fontweight='bold', color='darkblue')
-        ax.set_ylabel('Intensité relative', color='darkblue')
-        ax.grid(True, alpha=0.3, color='gray')
-        ax.set_facecolor('lightcyan')
-        ax.tick_params(colors='darkblue')
-    
-    def _plot_environmental_index(self, df, ax):
-        """Plot de l'indice environnemental composite"""
-        ax.plot(df['Year'], df['Environmental_Index'], label='Indice environnemental', 
-               linewidth=2, color='#2E8B57')
-        
-        ax.set_title('Indice Environnemental Composite', fontsize=12, fontweight='bold', color='darkblue')
-        ax.set_ylabel('Valeur de l\'indice', color='darkblue')
-        ax.grid(True, alpha=0.3, color='gray')
-        ax.set_facecolor('lightcyan')
-        ax.tick_params(colors='darkblue')
-    
-    def _plot_future_projections(self, df, ax):
-        """Plot des projections futures"""
-        ax.plot(df['Year'], df['Base_Value'], label='Données historiques', 
-               color='#1E90FF', alpha=0.7)
-        ax.plot(df['Year'], df['Future_Projection'], label='Projections futures', 
-               linewidth=2, color='#FF8C00', linestyle='--')
-        
-        ax.axvline(x=2020, color='red', linestyle=':', alpha=0.7, label='Début des projections')
-        
-        ax.set_title('Données Historiques et Projections Futures', fontsize=12, fontweight='bold', color='darkblue')
-        ax.set_ylabel(self.config["unit"], color='darkblue')
-        ax.legend()
-        ax.grid(True, alpha=0.3, color='gray')
-        ax.set_facecolor('lightcyan')
-        ax.tick_params(colors='darkblue')
+        CLIMATE_EVENTS.apply(df, self.data_type)
+    
+    def create_earth_analysis(self, df, show=True):
+        """Crée une analyse complète des données terrestres (rapport matplotlib)"""
+        # Import local: la couche rapport (et le cache disque) reste hors du noyau de simulation
+        from earth_report import EarthReport
+        EarthReport(self).create_earth_analysis(df, show=show)
     
     def _generate_earth_insights(self, df):
         """Génère des insights analytiques sur les données terrestres"""
-        print(f"🌍 INSIGHTS ANALYTIQUES - {self.config['description']}")
-        print("=" * 70)
-        
-        # 1. Statistiques de base
-        print("\n1. 📊 STATISTIQUES FONDAMENTALES:")
-        avg_value = df['Base_Value'].mean()
-        max_value = df['Base_Value'].max()
-        min_value = df['Base_Value'].min()
-        current_value = df['Base_Value'].iloc[-1]
-        
-        print(f"Valeur moyenne: {avg_value:.2f} {self.config['unit']}")
-        print(f"Valeur maximale: {max_value:.2f} {self.config['unit']}")
-        print(f"Valeur minimale: {min_value:.2f} {self.config['unit']}")
-        print(f"Valeur actuelle: {current_value:.2f} {self.config['unit']}")
-        
-        # 2. Analyse des tendances
-        print("\n2. 📈 ANALYSE DES TENDANCES:")
-        total_change = ((df['Base_Value'].iloc[-1] / df['Base_Value'].iloc[0]) - 1) * 100
-        recent_change = ((df['Base_Value'].iloc[-1] / df[df['Year'] >= 2000]['Base_Value'].iloc[0]) - 1) * 100
-        
-        print(f"Changement total depuis 1850: {total_change:+.1f}%")
-        print(f"Changement depuis 2000: {recent_change:+.1f}%")
-        print(f"Tendance principale: {self.config['trend']}")
-        
-        # 3. Risque environnemental
-        print("\n3. ⚠️  RISQUE ENVIRONNEMENTAL:")
-        current_risk = df['Risk_Level'].iloc[-1]
-        risk_trend = (df['Risk_Level'].iloc[-1] / df[df['Year'] >= 2000]['Risk_Level'].iloc[0] - 1) * 100
-        
-        print(f"Niveau de risque actuel: {current_risk:.1f}/100")
-        print(f"Évolution du risque depuis 2000: {risk_trend:+.1f}%")
-        
-        if current_risk > 70:
-            print("→ Niveau de risque ÉLEVÉ")
-        elif current_risk > 40:
-            print("→ Niveau de risque MODÉRÉ")
-        else:
-            print("→ Niveau de risque FAIBLE")
-        
-        # 4. Événements majeurs
-        print("\n4. 🌪️  ÉVÉNEMENTS CLIMATIQUES MARQUANTS:")
-        print("• 1815-1816: Éruption du Tambora - 'année sans été'")
-        print("• 1930-1939: Dust Bowl - sécheresse extrême aux États-Unis")
-        print("• 1982-1983: El Niño majeur avec impacts globaux")
-        print("• 1997-1998: El Niño le plus intense du 20ème siècle")
-        print("• 2003: Canicule européenne - 70,000 morts")
-        print("• 2005: Ouragan Katrina - New Orleans inondée")
-        print("• 2019-2020: Incendies records en Australie")
-        print("• 2020: Année record de températures globales")
-        
-        # 5. Impact humain
-        print("\n5. 👥 IMPACT HUMAIN:")
-        human_impact_current = df['Human_Impact'].iloc[-1]
-        human_growth = (df['Human_Impact'].iloc[-1] / df['Human_Impact'].iloc[0] - 1) * 100
-        
-        print(f"Facteur d'impact humain actuel: {human_impact_current:.1f}x")
-        print(f"Augmentation depuis 1850: {human_growth:+.0f}%")
-        
-        # 6. Projections futures
-        print("\n6. 🔮 PROJECTIONS FUTURES:")
-        future_change = ((df['Future_Projection'].iloc[-1] / 
-                         df['Base_Value'].iloc[-1]) - 1) * 100
-        
-        print(f"Changement projeté d'ici 2025: {future_change:+.1f}%")
-        
-        if self.config["trend"] == "croissante":
-            print("→ Tendance à la hausse prévue")
-        elif self.config["trend"] == "décroissante":
-            print("→ Tendance à la baisse prévue")
-        else:
-            print("→ Stabilité relative prévue")
-        
-        # 7. Implications environnementales
-        print("\n7. 🎯 IMPLICATIONS ENVIRONNEMENTALES:")
-        if self.data_type == "temperature":
-            print("• Impact direct sur les écosystèmes")
-            print("• Risque d'événements extrêmes accru")
-            print("• Implications pour la sécurité alimentaire")
-        
-        elif self.data_type == "co2":
-            print("• Principal facteur du changement climatique")
-            print("• Acidification des océans")
-            print("• Impact sur la photosynthèse")
-        
-        elif self.data_type == "sea_level":
-            print("• Menace pour les zones côtières")
-            print("• Déplacement des populations")
-            print("• Perte de territoires")
-        
-        elif self.data_type == "biodiversity":
-            print("• Effondrement des écosystèmes")
-            print("• Perte de services écosystémiques")
-            print("• Risque pour la sécurité alimentaire")
-        
-        print("• Nécessité d'actions d'atténuation")
-        print("• Importance de l'adaptation climatique")
-        print("• Enjeu de gouvernance mondiale")
+        from earth_report import EarthReport
+        EarthReport(self).generate_insights(df)
+
+def generate_all(types=None, workers=None, seed=None, resolution='annual', columns=None,
+                 compact=False):
+    """Génère plusieurs types de données en parallèle (un processus par type)
+    
+    Retourne un DataFrame large indexé par année (et par date en résolution
+    infra-annuelle), avec des colonnes MultiIndex (Data_Type, colonne).
+    Sans graine, une graine commune est tirée puis enregistrée dans
+    `df.attrs['seed']` pour pouvoir reproduire le lot.
+    """
+    types = list(types or EARTH_DATA_TYPES)
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    
+    jobs = [(data_type, seed, resolution, columns, compact) for data_type in types]
+    if workers == 1 or len(jobs) == 1:
+        frames = [_generate_job(job) for job in jobs]
+    else:
+        workers = workers or min(len(jobs), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            frames = list(pool.map(_generate_job, jobs))
+    
+    index = ['Year'] if resolution == 'annual' else ['Year', 'Date']
+    df = pd.concat([frame.set_index(index) for frame in frames], axis=1,
+                   keys=types, names=['Data_Type', 'Column'])
+    df.attrs['seed'] = seed
+    return df
+
+def _generate_job(args):
+    """Génère un type de données dans un processus du pool"""
+    data_type, seed, resolution, columns, compact = args
+    analyzer = EarthDataAnalyzer(data_type, seed=seed, resolution=resolution, compact=compact)
+    return analyzer.generate_earth_data(columns=columns)
+
+def _projection_shard(args):
+    """Calcule une tranche de membres d'ensemble dans un processus du pool"""
+    data_type, seed, resolution, compact, start_year, end_year, first_member, stop_member = args
+    analyzer = EarthDataAnalyzer(data_type, seed=seed, resolution=resolution, compact=compact)
+    analyzer.start_year, analyzer.end_year = start_year, end_year
+    return analyzer._projection_members(first_member, stop_member)
 
 def main():
     """Fonction principale pour l'analyse des données terrestres"""
-    # Types de données terrestres disponibles
-    earth_data_types = [
-        "temperature", "co2", "sea_level", "precipitation",
-        "glaciers", "biodiversity", "air_quality", "ocean_ph"
-    ]
+    # Import local: l'export (pyarrow) n'est chargé que par la ligne de commande
+    from earth_export import DEFAULT_BINARY_FORMAT, write_earth_data
+    
+    earth_data_types = EARTH_DATA_TYPES
     
     print("🌍 ANALYSE DES DONNÉES NUMÉRIQUES DE LA TERRE (1850-2025)")
     print("=" * 65)
@@ -749,10 +774,10 @@ def main():
     # Générer les données
     earth_data = analyzer.generate_earth_data()
     
-    # Sauvegarder les données
-    output_file = f'earth_{selected_type}_data_1850_2025.csv'
-    earth_data.to_csv(output_file, index=False)
-    print(f"💾 Données sauvegardées: {output_file}")
+    # Sauvegarder les données (CSV, et format binaire colonnaire pour les traitements en aval)
+    for extension in ('csv', DEFAULT_BINARY_FORMAT):
+        output_file = write_earth_data(earth_data, f'earth_{selected_type}_data_1850_2025.{extension}')
+        print(f"💾 Données sauvegardées: {output_file}")
     
     # Aperçu des données
     print("\n👀 Aperçu des données:")
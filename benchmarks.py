@@ -0,0 +1,280 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from Earth import EARTH_DATA_TYPES, EarthDataAnalyzer, generate_all
+from earth_report import EarthReport, ReportTemplate
+
+BENCHMARK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'benchmarks')
+DEFAULT_RESULTS = os.path.join(BENCHMARK_DIR, 'results.json')
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, 'baseline.json')
+
+# Tolérances de régression par rapport à la référence (relatives), et écarts absolus
+# en deçà desquels une différence est considérée comme du bruit de mesure
+TIME_TOLERANCE = 0.25
+MEMORY_TOLERANCE = 0.25
+TIME_NOISE_FLOOR = 0.005      # secondes
+MEMORY_NOISE_FLOOR = 1.0      # Mo
+
+BENCHMARK_SEED = 42
+BENCHMARK_TYPE = 'temperature'
+RESOLUTIONS = ('annual', 'monthly', 'daily')
+
+
+class Benchmark:
+    """Un cas mesuré: `setup()` prépare les arguments (non chronométré), `run(*args)` est mesuré"""
+
+    def __init__(self, name, run, setup=None, quick=False):
+        self.name = name
+        self.run = run
+        self.setup = setup or (lambda: ())
+        self.quick = quick
+
+    def measure(self, repeat):
+        """Durée médiane et minimale sur `repeat` exécutions, puis pic mémoire (tracemalloc)
+
+        Une première exécution non mesurée absorbe les imports paresseux et caches à froid.
+        """
+        self.run(*self.setup())
+        durations = []
+        for _ in range(repeat):
+            args = self.setup()
+            start = time.perf_counter()
+            self.run(*args)
+            durations.append(time.perf_counter() - start)
+
+        # Mesure mémoire à part: tracemalloc ralentit l'exécution
+        args = self.setup()
+        tracemalloc.start()
+        try:
+            self.run(*args)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        return {
+            'seconds': statistics.median(durations),
+            'min_seconds': min(durations),
+            'peak_mb': peak / 2 ** 20,
+        }
+
+
+def _analyzer(resolution='annual', data_type=BENCHMARK_TYPE):
+    return EarthDataAnalyzer(data_type, seed=BENCHMARK_SEED, resolution=resolution)
+
+
+def _dataset(resolution='annual', data_type=BENCHMARK_TYPE):
+    analyzer = _analyzer(resolution, data_type)
+    return analyzer, analyzer.generate_earth_data()
+
+
+def simulation_benchmarks():
+    """Génération complète, chaque _simulate_*, et application des événements"""
+    cases = []
+    for resolution in RESOLUTIONS:
+        quick = resolution == 'annual'
+        cases.append(Benchmark(f'generate/{resolution}',
+                               lambda a: a.generate_earth_data(),
+                               lambda r=resolution: (_analyzer(r),), quick))
+
+        for column, (method, _) in EarthDataAnalyzer.COLUMN_GRAPH.items():
+            cases.append(Benchmark(f'simulate/{method.lstrip("_")}/{resolution}',
+                                   lambda a, dates, m=method: getattr(a, m)(dates),
+                                   lambda r=resolution: (_analyzer(r), _analyzer(r)._time_axis()),
+                                   quick))
+
+        def events_setup(r=resolution):
+            analyzer, df = _dataset(r)
+            return analyzer, df.copy()
+        cases.append(Benchmark(f'events/{resolution}',
+                               lambda a, df: a._add_climate_events(df), events_setup, quick))
+    return cases
+
+
+def batch_benchmarks():
+    """Génération multi-types, ensembles Monte Carlo et cubes spatiaux"""
+    return [
+        Benchmark('generate_all/1_type',
+                  lambda: generate_all([BENCHMARK_TYPE], seed=BENCHMARK_SEED), quick=True),
+        Benchmark(f'generate_all/{len(EARTH_DATA_TYPES)}_types',
+                  lambda: generate_all(EARTH_DATA_TYPES, seed=BENCHMARK_SEED)),
+        Benchmark('ensemble/1_member',
+                  lambda a: a.generate_projection_ensemble(members=1),
+                  lambda: (_analyzer(),), quick=True),
+        Benchmark('ensemble/1000_members',
+                  lambda a: a.generate_projection_ensemble(members=1000),
+                  lambda: (_analyzer(),)),
+        Benchmark('ensemble/1000_members/monthly',
+                  lambda a: a.generate_projection_ensemble(members=1000),
+                  lambda: (_analyzer('monthly'),)),
+        Benchmark('spatial_cube/10deg',
+                  lambda a: a.generate_spatial_cube(10.0),
+                  lambda: (_analyzer(),), quick=True),
+        Benchmark('spatial_cube/2.5deg',
+                  lambda a: a.generate_spatial_cube(2.5),
+                  lambda: (_analyzer(),)),
+    ]
+
+
+def report_benchmarks(output_dir):
+    """Rapport matplotlib: figure neuve, puis gabarit réutilisé"""
+    template = ReportTemplate()
+
+    def report_setup():
+        analyzer, df = _dataset()
+        return EarthReport(analyzer), df
+
+    return [
+        Benchmark('report/new_figure',
+                  lambda report, df: report.render_report(df, output_dir, dpi=72),
+                  report_setup, quick=True),
+        Benchmark('report/template',
+                  lambda report, df: report.render_report(df, output_dir, dpi=72, template=template),
+                  report_setup),
+    ]
+
+
+def dashboard_benchmarks():
+    """Construction des figures Plotly du dashboard (sans cache de figures)"""
+    from streamlit import config, logger
+
+    # Hors `streamlit run` (mode "bare"), chaque appel st.* avertit de l'absence de contexte.
+    # La lecture de la configuration réinitialise le niveau: on la force avant de le fixer.
+    config.get_option('logger.level')
+    logger.set_log_level('error')
+
+    import Dashboard
+    from earth_summary import EarthSummary
+
+    dashboard = Dashboard.EarthStreamlitDashboard()
+    cases = []
+    for resolution in ('annual', 'monthly'):
+        quick = resolution == 'annual'
+
+        def setup(r=resolution):
+            return _dataset(r)
+
+        def ensemble_setup(r=resolution):
+            analyzer, df = _dataset(r)
+            return analyzer, df, analyzer.generate_projection_ensemble(members=100)
+
+        cases += [
+            Benchmark(f'dashboard/timeline/{resolution}',
+                      lambda a, df: dashboard.plot_main_timeline(df, a, 10), setup, quick),
+            Benchmark(f'dashboard/risk/{resolution}',
+                      lambda a, df: dashboard.plot_risk_analysis(df, a, 70), setup, quick),
+            Benchmark(f'dashboard/seasonal/{resolution}',
+                      lambda a, df: dashboard.plot_seasonal_analysis(df, a), setup, quick),
+            Benchmark(f'dashboard/impact/{resolution}',
+                      lambda a, df: dashboard.plot_impact_analysis(EarthSummary(df), a), setup, quick),
+            Benchmark(f'dashboard/projections/{resolution}',
+                      lambda a, df, ensemble: dashboard.plot_future_projections(df, a, ensemble),
+                      ensemble_setup, quick),
+            Benchmark(f'dashboard/extreme_events/{resolution}',
+                      lambda a, df: dashboard.plot_extreme_events(df, a), setup, quick),
+        ]
+    return cases
+
+
+def compare(results, baseline, time_tolerance=TIME_TOLERANCE, memory_tolerance=MEMORY_TOLERANCE):
+    """Liste des régressions par rapport à la référence (cas présents dans les deux)"""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        checks = (('seconds', time_tolerance, TIME_NOISE_FLOOR, 's'),
+                  ('peak_mb', memory_tolerance, MEMORY_NOISE_FLOOR, 'Mo'))
+        for metric, tolerance, floor, unit in checks:
+            current, previous = result[metric], reference[metric]
+            if current > previous * (1 + tolerance) and current - previous > floor:
+                regressions.append(f"{name}: {metric} {previous:.3f} -> {current:.3f} {unit} "
+                                   f"(+{(current / previous - 1) * 100:.0f}%)")
+    return regressions
+
+
+def environment():
+    """Description de la machine et des versions, enregistrée avec les résultats"""
+    return {
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def main():
+    """Exécute les benchmarks, enregistre les résultats et les compare à la référence"""
+    parser = argparse.ArgumentParser(description="Benchmarks de performance Earth / Dashboard")
+    parser.add_argument('--quick', action='store_true', help="petites échelles uniquement")
+    parser.add_argument('--filter', help="expression régulière sur le nom des cas")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default=DEFAULT_RESULTS)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="enregistre les résultats comme nouvelle référence")
+    parser.add_argument('--time-tolerance', type=float, default=TIME_TOLERANCE)
+    parser.add_argument('--memory-tolerance', type=float, default=MEMORY_TOLERANCE)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as report_dir:
+        cases = (simulation_benchmarks() + batch_benchmarks() + report_benchmarks(report_dir)
+                 + dashboard_benchmarks())
+        if args.quick:
+            cases = [case for case in cases if case.quick]
+        if args.filter:
+            cases = [case for case in cases if re.search(args.filter, case.name)]
+
+        print(f"⏱️  {len(cases)} benchmarks ({args.repeat} répétitions)")
+        results = {}
+        for case in cases:
+            # Les messages de progression du générateur ne polluent pas le tableau
+            with contextlib.redirect_stdout(io.StringIO()):
+                results[case.name] = case.measure(args.repeat)
+            result = results[case.name]
+            print(f"{case.name:<48} {result['seconds'] * 1000:10.1f} ms {result['peak_mb']:9.1f} Mo")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({'environment': environment(), 'results': results}, f, indent=2)
+    print(f"\n💾 Résultats enregistrés: {args.output}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({'environment': environment(), 'results': results}, f, indent=2)
+        print(f"📌 Référence enregistrée: {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print("ℹ️  Pas de référence: relancer avec --save-baseline pour en créer une")
+        return
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)['results']
+
+    regressions = compare(results, baseline, args.time_tolerance, args.memory_tolerance)
+    if regressions:
+        print("\n❌ Régressions par rapport à la référence:")
+        for regression in regressions:
+            print(f"• {regression}")
+        sys.exit(1)
+    print("\n✅ Aucune régression par rapport à la référence")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import os
+import re
+import subprocess
+import sys
+
+# Budget de temps d'import à froid (secondes, cumul `-X importtime`) par module
+IMPORT_BUDGETS = {
+    "Earth": 0.8,
+    "Dashboard": 2.0,
+}
+
+# Bibliothèques qui ne doivent pas être chargées à l'import (rapport matplotlib uniquement)
+FORBIDDEN_IMPORTS = ("matplotlib", "seaborn", "plotly.express")
+
+# Modules interdits en plus pour un module donné: le noyau de simulation ne charge ni
+# les couches export / cache / rapport, ni l'écriture Parquet (pandas importe déjà
+# pyarrow lui-même quand il est installé, d'où le contrôle sur pyarrow.parquet)
+FORBIDDEN_BY_MODULE = {
+    "Earth": ("earth_export", "earth_cache", "earth_report", "pyarrow.parquet"),
+}
+
+# Nombre de mesures par module (on retient la médiane)
+IMPORT_RUNS = 3
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s*(\d+)\s*\|\s*(\d+)\s*\|(\s*)(\S+)\s*$")
+
+
+def measure_import(module):
+    """Importe `module` dans un interpréteur neuf; retourne {module importé: cumul en s}"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Échec de l'import de {module}:\n{result.stderr}")
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            timings[match.group(4)] = int(match.group(2)) / 1e6
+    return timings
+
+
+def check_module(module, budget, runs=IMPORT_RUNS):
+    """Vérifie le budget et les imports interdits d'un module; retourne la liste des écarts"""
+    measures = [measure_import(module) for _ in range(runs)]
+    elapsed = sorted(timings[module] for timings in measures)[runs // 2]
+    timings = measures[0]
+
+    print(f"⏱️  {module}: {elapsed * 1000:.0f} ms (budget {budget * 1000:.0f} ms)")
+    slowest = sorted(((t, name) for name, t in timings.items()
+                      if name != module and "." not in name), reverse=True)[:5]
+    for t, name in slowest:
+        print(f"    {name:<30} {t * 1000:8.0f} ms")
+
+    failures = []
+    if elapsed > budget:
+        failures.append(f"{module}: {elapsed * 1000:.0f} ms > budget {budget * 1000:.0f} ms")
+    for forbidden in FORBIDDEN_IMPORTS + FORBIDDEN_BY_MODULE.get(module, ()):
+        if any(name == forbidden or name.startswith(forbidden + ".") for name in timings):
+            failures.append(f"{module}: importe {forbidden} à l'import")
+    return failures
+
+
+def main():
+    """Mesure les temps d'import et échoue (code 1) si un budget est dépassé"""
+    modules = sys.argv[1:] or list(IMPORT_BUDGETS)
+    failures = []
+    for module in modules:
+        failures += check_module(module, IMPORT_BUDGETS.get(module, float("inf")))
+
+    if failures:
+        print("\n❌ Budget d'import dépassé:")
+        for failure in failures:
+            print(f"• {failure}")
+        sys.exit(1)
+    print("\n✅ Temps d'import dans les budgets")
+
+
+if __name__ == "__main__":
+    main()
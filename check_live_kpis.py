@@ -0,0 +1,49 @@
+import sys
+
+import numpy as np
+import pandas as pd
+
+from earth_live import LiveMonitor
+
+# Écart toléré (en %) sur les variations d'un signal purement saisonnier
+SEASONAL_TOLERANCE = 0.5
+
+# Fins de flux testées: une par trimestre, pour balayer les phases du cycle annuel
+END_DATES = ("2024-03-15", "2024-06-30", "2024-09-10", "2024-12-31")
+
+
+def seasonal_feed(start, end, base=14.0, amplitude=15.0, freq="D"):
+    """Signal purement saisonnier (aucune tendance): cycle annuel autour de `base`"""
+    dates = pd.date_range(start, end, freq=freq)
+    phase = 2 * np.pi * (dates.dayofyear.to_numpy() - 1) / 365.25
+    return pd.DataFrame({'Date': dates, 'Base_Value': base + amplitude * np.sin(phase)})
+
+
+def check_feed(label, records, tolerance=SEASONAL_TOLERANCE):
+    """Alimente un moniteur; retourne les écarts si les variations s'éloignent de 0"""
+    monitor = LiveMonitor(columns=('Base_Value',))
+    monitor.extend(records)
+    changes = {'total_change': monitor.total_change, 'recent_change': monitor.recent_change}
+    print(f"📡 {label:<34} " + "  ".join(f"{name} {value:+.3f}%" for name, value in changes.items()))
+    return [f"{label}: {name} {value:+.3f}% (tolérance ±{tolerance}%)"
+            for name, value in changes.items() if not abs(value) <= tolerance]
+
+
+def main():
+    """Vérifie que le cycle saisonnier n'entre pas dans les KPI du mode direct (code 1 sinon)"""
+    failures = []
+    for end in END_DATES:
+        failures += check_feed(f"quotidien 1990-01-01 -> {end}", seasonal_feed("1990-01-01", end))
+        failures += check_feed(f"quotidien 1995-07-01 -> {end}", seasonal_feed("1995-07-01", end))
+    failures += check_feed("mensuel 1990-01 -> 2024-08", seasonal_feed("1990-01-01", "2024-08-01", freq="MS"))
+
+    if failures:
+        print("\n❌ Variations saisonnières dans les KPI:")
+        for failure in failures:
+            print(f"• {failure}")
+        sys.exit(1)
+    print("\n✅ Signal saisonnier pur: variations nulles")
+
+
+if __name__ == "__main__":
+    main()
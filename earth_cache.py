@@ -0,0 +1,90 @@
+import glob
+import hashlib
+import json
+import os
+
+from earth_export import HAS_ARROW, read_earth_data, write_earth_data
+from earth_timing import TIMER
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'cache')
+
+
+class EarthDataCache:
+    """Cache disque persistant des jeux de données générés par EarthDataAnalyzer
+
+    Chaque jeu de données est stocké dans un fichier binaire colonnaire (Feather /
+    Arrow IPC, ou .npz si pyarrow est absent) nommé d'après une empreinte de la
+    configuration du type de données, de la graine, de la période, de la
+    résolution, des colonnes et de la version du générateur. Toute modification
+    de l'un de ces éléments produit une nouvelle clé; les fichiers d'anciennes
+    versions sont purgés.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR):
+        self.directory = directory
+        self.extension = '.feather' if HAS_ARROW else '.npz'
+
+    def key(self, analyzer, columns=None):
+        """Empreinte SHA-256 des paramètres qui déterminent le jeu de données"""
+        payload = {
+            'data_type': analyzer.data_type,
+            'config': analyzer.config,
+            'seed': analyzer.seed,
+            'start_year': analyzer.start_year,
+            'end_year': analyzer.end_year,
+            'resolution': analyzer.resolution,
+            'compact': analyzer.compact,
+            'columns': sorted(columns) if columns is not None else None,
+            'version': analyzer.GENERATOR_VERSION,
+        }
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+    def path(self, analyzer, columns=None):
+        """Chemin du fichier de cache correspondant aux paramètres de l'analyseur"""
+        name = (f"earth_{analyzer.data_type}_{analyzer.resolution}_v{analyzer.GENERATOR_VERSION}_"
+                f"{self.key(analyzer, columns)[:20]}{self.extension}")
+        return os.path.join(self.directory, name)
+
+    def load(self, analyzer, columns=None):
+        """Relit un jeu de données en cache, ou None s'il est absent ou illisible"""
+        path = self.path(analyzer, columns)
+        if not os.path.exists(path):
+            return None
+        try:
+            # Le schéma de l'analyseur rétablit les types que le format ne conserve pas (.npz)
+            schema = analyzer.schema(columns) if hasattr(analyzer, 'schema') else None
+            return read_earth_data(path, columns, schema=schema)
+        except Exception:
+            # Fichier corrompu ou tronqué: on l'écarte et on régénère
+            self._remove(path)
+            return None
+
+    def save(self, analyzer, df, columns=None):
+        """Écrit le jeu de données de manière atomique (fichier temporaire + rename)"""
+        os.makedirs(self.directory, exist_ok=True)
+        self.prune(analyzer.GENERATOR_VERSION)
+
+        return write_earth_data(df.reset_index(drop=True), self.path(analyzer, columns))
+
+    def get_or_generate(self, analyzer, columns=None):
+        """Retourne le jeu de données depuis le disque, en le générant au premier appel"""
+        with TIMER.stage('cache/read'):
+            df = self.load(analyzer, columns)
+        if df is None:
+            df = analyzer.generate_earth_data(columns=columns)
+            with TIMER.stage('cache/write'):
+                self.save(analyzer, df, columns)
+        return df
+
+    def prune(self, version):
+        """Supprime les fichiers produits par d'autres versions du générateur"""
+        for path in glob.glob(os.path.join(self.directory, 'earth_*_*_v*_*.*')):
+            if f"_v{version}_" not in os.path.basename(path):
+                self._remove(path)
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
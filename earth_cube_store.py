@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CUBE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'cubes')
+
+# Taille cible (en octets) d'un morceau de cube généré puis écrit sur disque
+CUBE_CHUNK_BYTES = 64 * 2 ** 20
+
+
+class SpatialCubeStore:
+    """Cube spatio-temporel (temps, lat, lon) stocké sur disque et lu par memory-mapping
+
+    Le cube est écrit deux fois, en fichiers .npy float32:
+    - `time_major.npy` (temps, lat, lon): une tranche temporelle est contiguë;
+    - `cell_major.npy` (lat, lon, temps): la série d'une maille est contiguë.
+    Les lectures retournent des vues NumPy sur le memmap (aucune copie), si bien
+    que plusieurs processus partagent les mêmes pages via le cache du système.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, 'meta.json'), encoding='utf-8') as f:
+            self.meta = json.load(f)
+        with np.load(os.path.join(directory, 'axes.npz'), allow_pickle=False) as axes:
+            self.lat = axes['lat']
+            self.lon = axes['lon']
+            self.dates = pd.DatetimeIndex(axes['time'])
+        self.time_major = np.load(os.path.join(directory, 'time_major.npy'), mmap_mode='r')
+        self.cell_major = np.load(os.path.join(directory, 'cell_major.npy'), mmap_mode='r')
+
+    @classmethod
+    def build(cls, analyzer, directory, grid_deg=None, chunk_rows=None):
+        """Génère le cube par morceaux temporels et l'écrit de manière atomique"""
+        lat, lon = analyzer.spatial_grid(grid_deg)
+        n_rows = analyzer._n_rows()
+        shape = (n_rows, len(lat), len(lon))
+        chunk_rows = chunk_rows or max(1, CUBE_CHUNK_BYTES // (4 * len(lat) * len(lon)))
+
+        parent = os.path.dirname(os.path.abspath(directory))
+        os.makedirs(parent, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(dir=parent, suffix='.tmp')
+        try:
+            time_major = np.lib.format.open_memmap(os.path.join(tmp_dir, 'time_major.npy'),
+                                                   mode='w+', dtype=np.float32, shape=shape)
+            cell_major = np.lib.format.open_memmap(os.path.join(tmp_dir, 'cell_major.npy'),
+                                                   mode='w+', dtype=np.float32,
+                                                   shape=(len(lat), len(lon), n_rows))
+            # Le cube complet n'est jamais en mémoire: un morceau à la fois
+            for start in range(0, n_rows, chunk_rows):
+                stop = min(start + chunk_rows, n_rows)
+                chunk = time_major[start:stop]
+                analyzer._fill_spatial(chunk, analyzer._time_axis(start, stop), lat, lon)
+                cell_major[:, :, start:stop] = chunk.transpose(1, 2, 0)
+            time_major.flush()
+            cell_major.flush()
+            del chunk, time_major, cell_major
+
+            np.savez(os.path.join(tmp_dir, 'axes.npz'), lat=lat, lon=lon,
+                     time=analyzer._time_axis().to_numpy())
+            with open(os.path.join(tmp_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+                json.dump(cube_params(analyzer, grid_deg), f, ensure_ascii=False, default=str)
+
+            try:
+                os.replace(tmp_dir, directory)
+            except OSError:
+                # Un autre processus a publié le même cube entre-temps: on garde le sien,
+                # sauf s'il est illisible, auquel cas on le remplace
+                try:
+                    return cls(directory)
+                except (OSError, ValueError, KeyError):
+                    shutil.rmtree(directory, ignore_errors=True)
+                    os.replace(tmp_dir, directory)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        return cls(directory)
+
+    def time_slice(self, row):
+        """Champ (lat, lon) d'un pas de temps - vue sans copie"""
+        return self.time_major[row]
+
+    def cell_series(self, lat, lon):
+        """Série temporelle de la maille la plus proche de (lat, lon) - vue sans copie"""
+        i = int(np.abs(self.lat - lat).argmin())
+        j = int(np.abs(self.lon - lon).argmin())
+        return self.cell_major[i, j]
+
+    def year_field(self, year):
+        """Champ moyen d'une année (vue sans copie en résolution annuelle)"""
+        rows = np.flatnonzero(self.dates.year == year)
+        if len(rows) == 0:
+            raise ValueError(f"Année hors de la période du cube: {year}")
+        if len(rows) == 1:
+            return self.time_slice(rows[0])
+        return self.time_major[rows[0]:rows[-1] + 1].mean(axis=0, dtype=np.float64).astype(np.float32)
+
+
+def cube_params(analyzer, grid_deg=None):
+    """Paramètres qui déterminent le contenu d'un cube"""
+    return {
+        'data_type': analyzer.data_type,
+        'config': analyzer.config,
+        'seed': analyzer.seed,
+        'start_year': analyzer.start_year,
+        'end_year': analyzer.end_year,
+        'resolution': analyzer.resolution,
+        'grid_deg': grid_deg or analyzer.SPATIAL_GRID_DEG,
+        'version': analyzer.GENERATOR_VERSION,
+    }
+
+
+def cube_path(analyzer, grid_deg=None, root=DEFAULT_CUBE_DIR):
+    """Dossier du cube correspondant aux paramètres de l'analyseur"""
+    encoded = json.dumps(cube_params(analyzer, grid_deg), sort_keys=True, ensure_ascii=False, default=str)
+    key = hashlib.sha256(encoded.encode('utf-8')).hexdigest()[:20]
+    return os.path.join(root, f"cube_{analyzer.data_type}_{analyzer.resolution}_"
+                              f"v{analyzer.GENERATOR_VERSION}_{key}")
+
+
+def open_cube(analyzer, grid_deg=None, root=DEFAULT_CUBE_DIR):
+    """Ouvre le cube en lecture (memmap), en le construisant s'il n'existe pas encore"""
+    directory = cube_path(analyzer, grid_deg, root)
+    try:
+        return SpatialCubeStore(directory)
+    except (OSError, ValueError, KeyError):
+        # Cube absent ou incomplet: on le (re)construit
+        return SpatialCubeStore.build(analyzer, directory, grid_deg)
@@ -0,0 +1,83 @@
+import numpy as np
+
+
+def _buckets(n, n_buckets, start=0, stop=None):
+    """Bornes (n_buckets + 1) de tranches contiguës de taille quasi égale sur [start, stop)"""
+    stop = n if stop is None else stop
+    return np.linspace(start, stop, n_buckets + 1).astype(np.int64)
+
+
+def lttb_indices(x, y, n_out):
+    """Indices retenus par Largest-Triangle-Three-Buckets (Steinarsson, 2013)
+
+    Le premier et le dernier point sont conservés; les points intermédiaires
+    sont répartis en `n_out - 2` tranches, et dans chaque tranche on garde le
+    point qui forme le plus grand triangle avec le point retenu précédemment et
+    la moyenne de la tranche suivante. La forme visuelle de la courbe (pics,
+    creux) est préservée avec `n_out` points quelle que soit la longueur de la série.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = _buckets(n, n_out - 2, 1, n - 1)
+
+    # Moyennes de chaque tranche (le dernier point sert de "tranche suivante" finale)
+    counts = np.diff(edges)
+    valid = ~np.isnan(y)
+    sum_x = np.add.reduceat(np.where(valid, x, 0.0)[:n - 1], edges[:-1])
+    sum_y = np.add.reduceat(np.where(valid, y, 0.0)[:n - 1], edges[:-1])
+    n_valid = np.add.reduceat(valid[:n - 1].astype(np.int64), edges[:-1])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        avg_x = np.where(n_valid > 0, sum_x / n_valid, x[edges[:-1]] + (counts - 1) / 2)
+        avg_y = sum_y / n_valid
+    avg_x = np.append(avg_x, x[-1])
+    avg_y = np.append(avg_y, y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        # Double de l'aire du triangle (a, candidat, moyenne de la tranche suivante)
+        area = np.abs((x[a] - avg_x[i + 1]) * (y[start:stop] - y[a])
+                      - (x[a] - x[start:stop]) * (avg_y[i + 1] - y[a]))
+        a = start + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax_indices(y, n_out):
+    """Indices du minimum et du maximum de chaque tranche (décimation min/max)
+
+    Adaptée aux barres et aux signaux très bruités: les extrêmes de chaque
+    tranche sont conservés, au plus `n_out` points au total.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    n_buckets = n_out // 2
+    if n_out >= n or n_buckets < 1:
+        return np.arange(n)
+
+    # Tranches contiguës: bornes [bounds[k], bounds[k + 1]) dans l'ordre des lignes
+    bucket = np.arange(n) * n_buckets // n
+    bounds = np.searchsorted(bucket, np.arange(n_buckets + 1))
+    n_valid = np.add.reduceat((~np.isnan(y)).astype(np.int64), bounds[:-1])
+
+    # Tri par tranche puis par valeur (NaN en fin de tranche): le premier indice de
+    # chaque tranche est son minimum, le dernier indice valide son maximum
+    order = np.lexsort((y, bucket))
+    first = order[bounds[:-1]]
+    last = order[bounds[:-1] + np.maximum(n_valid, 1) - 1]
+    return np.unique(np.concatenate((first, last)))
+
+
+def downsample_indices(x, y, n_out, method='lttb'):
+    """Indices des points à tracer pour un budget de `n_out` points"""
+    if method == 'lttb':
+        return lttb_indices(x, y, n_out)
+    if method == 'minmax':
+        return minmax_indices(y, n_out)
+    raise ValueError(f"Méthode de sous-échantillonnage inconnue: {method}")
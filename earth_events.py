@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+
+
+class ClimateEventCatalog:
+    """Catalogue déclaratif des événements climatiques historiques
+
+    Chaque événement couvre une période [start, end] (bornes incluses), peut être
+    restreint à certains types de données (`data_types`, None = tous) et applique
+    des facteurs multiplicatifs (`multipliers`) puis des plafonds (`caps`) aux
+    colonnes concernées. Les périodes sont rangées dans un IntervalIndex et ne
+    doivent pas se chevaucher: chaque année relève d'au plus un événement.
+    """
+
+    def __init__(self, events):
+        self.events = pd.DataFrame(events)
+        self.intervals = pd.IntervalIndex.from_arrays(self.events['start'], self.events['end'],
+                                                      closed='both')
+        if self.intervals.is_overlapping:
+            raise ValueError("Les périodes du catalogue d'événements se chevauchent")
+
+    def _applies_to(self, data_type):
+        """Masque des événements concernant le type de données"""
+        return np.array([types is None or data_type in types
+                         for types in self.events['data_types']], dtype=bool)
+
+    def query(self, start_year, end_year, data_type=None):
+        """Retourne les événements qui recoupent la période [start_year, end_year]"""
+        mask = self.intervals.overlaps(pd.Interval(start_year, end_year, closed='both'))
+        if data_type is not None:
+            mask &= self._applies_to(data_type)
+        return self.events.loc[mask, ['start', 'end', 'name', 'label']].reset_index(drop=True)
+
+    def apply(self, df, data_type):
+        """Applique les événements au DataFrame, en une passe vectorisée par colonne"""
+        # Indice de l'événement de chaque ligne (-1 = aucun événement)
+        event_idx = self.intervals.get_indexer(df['Year'])
+        active = self._applies_to(data_type)
+
+        columns = {name for multipliers in self.events['multipliers'] for name in multipliers}
+        for column in sorted(columns):
+            if column not in df.columns:
+                continue
+
+            # Tables de correspondance événement -> facteur / plafond, la dernière
+            # case (indice -1) servant de valeur neutre pour les années sans événement
+            factors = np.ones(len(self.events) + 1)
+            caps = np.full(len(self.events) + 1, np.inf)
+            for i, (multipliers, event_caps) in enumerate(zip(self.events['multipliers'],
+                                                              self.events['caps'])):
+                if active[i]:
+                    factors[i] = multipliers.get(column, 1.0)
+                    caps[i] = event_caps.get(column, np.inf)
+
+            # Le type de la colonne est conservé (float32 en mode compact)
+            dtype = df[column].dtype
+            values = df[column].to_numpy() * factors[event_idx]
+            df[column] = np.minimum(values, caps[event_idx]).astype(dtype, copy=False)
+
+        return df
+
+
+CLIMATE_EVENTS = ClimateEventCatalog([
+    {"start": 1815, "end": 1816, "name": "Éruption du Tambora",
+     "label": "Éruption du Tambora - 'année sans été'",
+     "data_types": None, "multipliers": {"Base_Value": 0.9, "Risk_Level": 1.2},
+     "caps": {"Risk_Level": 100}},
+    {"start": 1930, "end": 1939, "name": "Dust Bowl",
+     "label": "Dust Bowl - sécheresse extrême aux États-Unis",
+     "data_types": ("temperature", "precipitation"),
+     "multipliers": {"Base_Value": 1.1, "Risk_Level": 1.3}, "caps": {"Risk_Level": 100}},
+    {"start": 1982, "end": 1983, "name": "El Niño majeur",
+     "label": "El Niño majeur avec impacts globaux",
+     "data_types": None, "multipliers": {"Base_Value": 1.05, "Extreme_Events": 1.5}, "caps": {}},
+    {"start": 1997, "end": 1998, "name": "El Niño record",
+     "label": "El Niño le plus intense du 20ème siècle",
+     "data_types": None, "multipliers": {"Base_Value": 1.08, "Extreme_Events": 1.8}, "caps": {}},
+    {"start": 2003, "end": 2003, "name": "Canicule européenne",
+     "label": "Canicule européenne - 70,000 morts",
+     "data_types": ("temperature",), "multipliers": {"Base_Value": 1.1, "Risk_Level": 1.4},
+     "caps": {"Risk_Level": 100}},
+    {"start": 2005, "end": 2005, "name": "Ouragan Katrina",
+     "label": "Ouragan Katrina - New Orleans inondée",
+     "data_types": None, "multipliers": {"Extreme_Events": 1.6}, "caps": {}},
+    {"start": 2011, "end": 2011, "name": "Sécheresse du Texas + Fukushima",
+     "label": "Sécheresse du Texas et accident de Fukushima",
+     "data_types": None, "multipliers": {"Risk_Level": 1.3},
+     "caps": {"Risk_Level": 100}},
+    {"start": 2019, "end": 2019, "name": "Incendies en Australie",
+     "label": "Incendies records en Australie",
+     "data_types": ("temperature", "air_quality"),
+     "multipliers": {"Base_Value": 1.05, "Risk_Level": 1.2}, "caps": {"Risk_Level": 100}},
+    {"start": 2020, "end": 2020, "name": "Année record",
+     "label": "Année record de températures globales",
+     "data_types": ("temperature",), "multipliers": {"Base_Value": 1.02}, "caps": {}},
+])
@@ -0,0 +1,190 @@
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+    HAS_ARROW = True
+except ImportError:
+    HAS_ARROW = False
+
+# Formats d'export, par extension de fichier
+EXPORT_FORMATS = {
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.feather': 'feather',
+    '.arrow': 'feather',
+    '.npz': 'npz',
+}
+
+# Format binaire par défaut: Parquet si pyarrow est installé, .npz compressé sinon
+DEFAULT_BINARY_FORMAT = 'parquet' if HAS_ARROW else 'npz'
+
+# Compression des formats binaires
+ARROW_COMPRESSION = 'zstd'
+
+
+def export_format(path, fmt=None):
+    """Format d'un fichier d'export: explicite ou déduit de son extension"""
+    fmt = fmt or EXPORT_FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt not in EXPORT_FORMATS.values():
+        raise ValueError(f"Format d'export inconnu pour {path}: {fmt}")
+    if fmt in ('parquet', 'feather') and not HAS_ARROW:
+        raise ImportError(f"Le format {fmt} nécessite pyarrow (pip install pyarrow)")
+    return fmt
+
+
+def export_earth_data(analyzer, path, fmt=None, columns=None, chunk_rows=None):
+    """Génère et écrit les données d'un analyseur par morceaux, sans tout garder en mémoire
+
+    Chaque morceau produit par `iter_earth_data` est écrit dès sa génération
+    (groupe de lignes Parquet, lot Arrow IPC, ou bloc CSV); seul le format .npz,
+    qui stocke des tableaux complets, est assemblé en mémoire avant l'écriture.
+    """
+    fmt = export_format(path, fmt)
+    chunks = analyzer.iter_earth_data(columns=columns, chunk_rows=chunk_rows)
+    return write_earth_data(chunks, path, fmt)
+
+
+def write_earth_data(data, path, fmt=None, columns=None):
+    """Écrit un DataFrame (ou une suite de DataFrames) de manière atomique
+
+    `columns` restreint l'export à ces colonnes (la colonne Year, et Date en
+    résolution infra-annuelle, sont toujours conservées).
+    """
+    fmt = export_format(path, fmt)
+    chunks = [data] if isinstance(data, pd.DataFrame) else data
+    if columns is not None:
+        chunks = (_select(chunk, columns) for chunk in chunks)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    os.close(fd)
+    try:
+        _WRITERS[fmt](chunks, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        _remove(tmp_path)
+        raise
+    return path
+
+
+def read_earth_data(path, columns=None, fmt=None, schema=None):
+    """Relit un fichier exporté, en ne chargeant que les colonnes demandées
+
+    Feather conserve tous les types pandas, catégories comprises; Parquet relit
+    les catégories d'après les métadonnées pandas du fichier. `schema`
+    ({nom: dtype}, voir EarthDataAnalyzer.schema) est réappliqué après la
+    lecture: un .npz, qui ne conserve que les tableaux, relit alors le même
+    DataFrame que Parquet ou Feather (un CSV retrouve les types de colonnes).
+    """
+    fmt = export_format(path, fmt)
+    if fmt == 'parquet':
+        file_schema = pq.read_schema(path)
+        wanted = _wanted(file_schema.names, columns)
+        df = pd.read_parquet(path, columns=wanted)
+        # Parquet ne restaure en dictionnaire que les chaînes: catégories numériques d'après pandas
+        metadata = file_schema.pandas_metadata or {}
+        categorical = [column['name'] for column in metadata.get('columns', [])
+                       if column.get('pandas_type') == 'categorical' and column['name'] in wanted]
+        df = df.astype({name: 'category' for name in categorical})
+    elif fmt == 'feather':
+        with pa.memory_map(path) as source:
+            table = pa.ipc.open_file(source).read_all()
+        df = table.select(_wanted(table.column_names, columns)).to_pandas()
+    elif fmt == 'npz':
+        with np.load(path, allow_pickle=False) as archive:
+            df = pd.DataFrame({name: archive[name] for name in _wanted(archive.files, columns)})
+    else:
+        header = pd.read_csv(path, nrows=0).columns
+        wanted = _wanted(header, columns)
+        df = pd.read_csv(path, usecols=wanted,
+                         parse_dates=['Date'] if 'Date' in wanted else False)[wanted]
+    if schema is not None:
+        df = _apply_schema(df, schema)
+    return df
+
+
+def _apply_schema(df, schema):
+    """Convertit les colonnes présentes dont le type diffère du schéma"""
+    dtypes = {name: dtype for name, dtype in schema.items()
+              if name in df.columns and str(df[name].dtype) != str(dtype)}
+    return df.astype(dtypes) if dtypes else df
+
+
+def _wanted(available, columns):
+    """Colonnes à lire: clés temporelles présentes puis colonnes demandées"""
+    if columns is None:
+        return list(available)
+    keys = [name for name in ('Year', 'Date') if name in available]
+    missing = [name for name in columns if name not in available]
+    if missing:
+        raise KeyError(f"Colonnes absentes du fichier: {', '.join(missing)}")
+    return keys + [name for name in columns if name not in keys]
+
+
+def _select(df, columns):
+    return df[_wanted(df.columns, columns)]
+
+
+def _write_csv(chunks, path):
+    header = True
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        for chunk in chunks:
+            chunk.to_csv(f, index=False, header=header)
+            header = False
+
+
+def _write_parquet(chunks, path):
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema, compression=ARROW_COMPRESSION)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def _write_feather(chunks, path):
+    # Feather v2 = format de fichier Arrow IPC: un lot d'enregistrements par morceau
+    options = pa.ipc.IpcWriteOptions(compression=ARROW_COMPRESSION)
+    writer = None
+    with pa.OSFile(path, 'wb') as sink:
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pa.ipc.new_file(sink, table.schema, options=options)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+
+
+def _write_npz(chunks, path):
+    frame = pd.concat(list(chunks), ignore_index=True)
+    with open(path, 'wb') as f:
+        np.savez_compressed(f, **{name: frame[name].to_numpy() for name in frame.columns})
+
+
+_WRITERS = {
+    'csv': _write_csv,
+    'parquet': _write_parquet,
+    'feather': _write_feather,
+    'npz': _write_npz,
+}
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
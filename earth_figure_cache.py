@@ -0,0 +1,66 @@
+import json
+import threading
+from collections import OrderedDict, defaultdict
+
+import plotly.io as pio
+
+
+class FigureCache:
+    """Cache LRU borné des figures Plotly sérialisées (spécifications JSON)
+
+    Les figures sont indexées par (graphique, clé), la clé regroupant l'identité
+    du jeu de données et les seuls paramètres dont dépend le graphique. Les
+    entrées les moins récemment servies sont évincées au-delà de `max_entries`
+    figures ou de `max_bytes` octets de JSON. Le cache est partagé entre
+    sessions (threads) d'où le verrou; des compteurs de succès/échecs par
+    graphique mesurent son efficacité.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=64 * 2 ** 20):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = defaultdict(int)
+        self.misses = defaultdict(int)
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, chart, key):
+        """Spécification (dict) de la figure en cache, ou None"""
+        with self._lock:
+            spec = self.entries.get((chart, key))
+            if spec is None:
+                self.misses[chart] += 1
+                return None
+            self.entries.move_to_end((chart, key))
+            self.hits[chart] += 1
+        return json.loads(spec)
+
+    def put(self, chart, key, fig):
+        """Sérialise et mémorise une figure"""
+        spec = pio.to_json(fig, validate=False)
+        with self._lock:
+            previous = self.entries.pop((chart, key), None)
+            if previous is not None:
+                self.size -= len(previous)
+            self.entries[(chart, key)] = spec
+            self.size += len(spec)
+            while self.entries and (len(self.entries) > self.max_entries or self.size > self.max_bytes):
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= len(evicted)
+                self.evictions += 1
+
+    def stats(self):
+        """Compteurs par graphique: {graphique: (succès, échecs, taux de succès)}"""
+        with self._lock:
+            charts = sorted(set(self.hits) | set(self.misses))
+            return {chart: (self.hits[chart], self.misses[chart],
+                            self.hits[chart] / (self.hits[chart] + self.misses[chart]))
+                    for chart in charts}
+
+    def clear(self):
+        """Vide le cache (les compteurs sont conservés)"""
+        with self._lock:
+            self.entries.clear()
+            self.size = 0
@@ -0,0 +1,418 @@
+import argparse
+import bisect
+import io
+import math
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from earth_summary import RISK_COLORS, RISK_LABELS, classify_risk
+
+LIVE_FEED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'live')
+
+# Colonnes suivies en direct (une mémoire tampon circulaire chacune)
+LIVE_COLUMNS = ('Base_Value', 'Risk_Level', 'Extreme_Events')
+
+# Échantillons conservés par variable, fenêtre du lissage glissant (en échantillons)
+LIVE_CAPACITY = 10_000
+LIVE_WINDOW = 30
+
+# Quantile du seuil d'événements extrêmes (comme plot_extreme_events)
+LIVE_QUANTILE = 0.9
+
+# Durée d'une année glissante en secondes (année grégorienne moyenne)
+LIVE_YEAR = 31_556_952
+
+
+def live_feed_path(data_type, directory=LIVE_FEED_DIR):
+    """Fichier du flux en direct d'un type de données"""
+    return os.path.join(directory, f"earth_{data_type}_live.csv")
+
+
+class RingBuffer:
+    """Tampon circulaire de taille fixe: ajout en O(1), les valeurs les plus anciennes sont écrasées"""
+
+    def __init__(self, capacity, dtype=np.float64):
+        self.data = np.empty(capacity, dtype=dtype)
+        self.capacity = capacity
+        self.head = 0     # prochaine case écrite
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def append(self, value):
+        """Ajoute une valeur; retourne celle qu'elle remplace (None si le tampon n'était pas plein)"""
+        evicted = self.data[self.head] if self.count == self.capacity else None
+        self.data[self.head] = value
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        return evicted
+
+    @property
+    def last(self):
+        return self.data[self.head - 1] if self.count else None
+
+    def values(self):
+        """Copie des valeurs, de la plus ancienne à la plus récente"""
+        if self.count < self.capacity:
+            return self.data[:self.count].copy()
+        return np.concatenate((self.data[self.head:], self.data[:self.head]))
+
+
+class RollingMean:
+    """Moyenne glissante sur `window` échantillons, en O(1) par échantillon (NaN ignorés)
+
+    La somme courante est recalculée exactement tous les `window` ajouts pour
+    borner la dérive des arrondis (coût amorti O(1)).
+    """
+
+    def __init__(self, window):
+        self.window = RingBuffer(window)
+        self.total = 0.0
+        self.valid = 0
+        self._since_resync = 0
+
+    def add(self, value):
+        """Ajoute un échantillon; retourne la moyenne de la fenêtre"""
+        evicted = self.window.append(value)
+        if evicted is not None and not np.isnan(evicted):
+            self.total -= evicted
+            self.valid -= 1
+        if not np.isnan(value):
+            self.total += value
+            self.valid += 1
+
+        self._since_resync += 1
+        if self._since_resync >= self.window.capacity:
+            values = self.window.values()
+            self.total = float(np.nansum(values))
+            self.valid = int(np.count_nonzero(~np.isnan(values)))
+            self._since_resync = 0
+        return self.total / self.valid if self.valid else np.nan
+
+
+class TrailingYearMean:
+    """Moyenne des échantillons de la dernière année glissante, en O(1) amorti (NaN ignorés)
+
+    Les échantillons de plus d'un an sont retirés de la somme courante à mesure
+    que le temps avance; la somme est recalculée exactement chaque fois que le
+    nombre d'ajouts atteint la taille de la fenêtre, comme pour RollingMean.
+    """
+
+    def __init__(self, span=LIVE_YEAR):
+        self.span = span
+        self.samples = deque()
+        self.total = 0.0
+        self.valid = 0
+        self._since_resync = 0
+
+    def add(self, seconds, value):
+        """Ajoute un échantillon (date en secondes epoch); retourne la moyenne de l'année écoulée"""
+        self.samples.append((seconds, value))
+        if not math.isnan(value):
+            self.total += value
+            self.valid += 1
+        cutoff = seconds - self.span
+        while self.samples[0][0] <= cutoff:
+            _, evicted = self.samples.popleft()
+            if not math.isnan(evicted):
+                self.total -= evicted
+                self.valid -= 1
+
+        self._since_resync += 1
+        if self._since_resync >= len(self.samples):
+            values = [value for _, value in self.samples if not math.isnan(value)]
+            self.total = math.fsum(values)
+            self.valid = len(values)
+            self._since_resync = 0
+        return self.value
+
+    @property
+    def value(self):
+        return self.total / self.valid if self.valid else np.nan
+
+
+class P2Quantile:
+    """Quantile estimé en flux par l'algorithme P² (Jain & Chlamtac, 1985)
+
+    Cinq marqueurs (minimum, quantiles p/2, p, (1+p)/2, maximum) sont ajustés
+    par interpolation parabolique à chaque échantillon: O(1) en temps et en
+    mémoire, sans conserver l'historique. Exact tant que moins de cinq
+    échantillons ont été vus.
+    """
+
+    def __init__(self, p):
+        self.p = p
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, value):
+        if np.isnan(value):
+            return
+        q, n = self.heights, self.positions
+        if len(q) < 5:
+            bisect.insort(q, value)
+            return
+
+        # Cellule de l'échantillon, en étendant les extrêmes si besoin
+        if value < q[0]:
+            q[0] = value
+            k = 0
+        elif value >= q[4]:
+            q[4] = value
+            k = 3
+        else:
+            k = bisect.bisect_right(q, value) - 1
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # Ajustement des marqueurs intermédiaires trop éloignés de leur position idéale
+        for i in (1, 2, 3):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                height = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+                if not q[i - 1] < height < q[i + 1]:
+                    height = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = height
+                n[i] += d
+
+    @property
+    def value(self):
+        if len(self.heights) < 5:
+            return float(np.percentile(self.heights, self.p * 100)) if self.heights else np.nan
+        return self.heights[2]
+
+
+class LiveMonitor:
+    """Séries en direct et indicateurs mis à jour en O(1) par échantillon
+
+    Chaque variable est conservée dans un tampon circulaire (les LIVE_CAPACITY
+    derniers échantillons). La valeur lissée, le seuil du 90e centile des
+    événements extrêmes et les KPI (valeur actuelle, variations, risque) sont
+    tenus à jour à chaque ajout, sans relire l'historique. Les attributs de KPI
+    sont ceux d'EarthSummary utilisés par les cartes du dashboard.
+    Comme dans EarthSummary, les variations comparent des moyennes sur une
+    année: la dernière année glissante, la première année du flux et l'année
+    d'ancrage (sommes courantes; la moyenne de l'année d'ancrage n'est
+    utilisée qu'une fois celle-ci écoulée), si bien que le cycle saisonnier
+    n'y entre pas.
+    """
+
+    def __init__(self, columns=LIVE_COLUMNS, capacity=LIVE_CAPACITY, window=LIVE_WINDOW,
+                 anchor_year=2000, quantile=LIVE_QUANTILE):
+        self.times = RingBuffer(capacity, dtype='datetime64[s]')
+        self.buffers = {name: RingBuffer(capacity) for name in columns}
+        self.smoothed = RingBuffer(capacity)
+        self.smoother = RollingMean(window)
+        self.threshold = P2Quantile(quantile)
+        self.anchor_year = anchor_year
+        self._anchor_start = np.datetime64(f'{anchor_year:04d}-01-01', 's')
+        self._anchor_covered = False
+        self.latest = {name: TrailingYearMean() for name in columns}
+        # Sommes [total, valides] de la première année et de l'année d'ancrage
+        self._first_sums = {name: [0.0, 0] for name in columns}
+        self._anchor_sums = {name: [0.0, 0] for name in columns}
+        self.first = {}
+        self.anchor = {}
+        self.samples = 0
+        self.start_year = None
+        self.start_time = None
+
+    def append(self, timestamp, values):
+        """Ajoute un échantillon {colonne: valeur}; les colonnes absentes valent NaN"""
+        timestamp = np.datetime64(timestamp, 's')
+        year = timestamp.astype('datetime64[Y]').astype(np.int64) + 1970
+        seconds = int(timestamp.astype(np.int64))
+        if self.start_time is None:
+            self.start_time = seconds
+            self.start_year = int(year)
+            # L'année d'ancrage ne sert de référence que si le flux la couvre entièrement
+            self._anchor_covered = timestamp <= self._anchor_start
+        in_first_year = seconds < self.start_time + LIVE_YEAR
+        in_anchor_year = self._anchor_covered and year == self.anchor_year
+        if self._anchor_covered and year > self.anchor_year and not self.anchor:
+            # Année d'ancrage écoulée: ses moyennes deviennent la référence
+            self.anchor = {name: total / valid for name, (total, valid) in self._anchor_sums.items() if valid}
+
+        self.times.append(timestamp)
+        for name, buffer in self.buffers.items():
+            value = float(values.get(name, np.nan))
+            buffer.append(value)
+            self.latest[name].add(seconds, value)
+            if np.isnan(value):
+                continue
+            # Moyennes courantes de la première année et de l'année d'ancrage
+            if in_first_year:
+                sums = self._first_sums[name]
+                sums[0] += value
+                sums[1] += 1
+                self.first[name] = sums[0] / sums[1]
+            if in_anchor_year:
+                self._anchor_sums[name][0] += value
+                self._anchor_sums[name][1] += 1
+
+        self.smoothed.append(self.smoother.add(self.buffers['Base_Value'].last))
+        if 'Extreme_Events' in self.buffers:
+            self.threshold.add(self.buffers['Extreme_Events'].last)
+        self.samples += 1
+
+    def extend(self, records):
+        """Ajoute les lignes d'un DataFrame (colonne Date puis colonnes suivies)"""
+        columns = [name for name in self.buffers if name in records.columns]
+        times = records['Date'].to_numpy()
+        values = records[columns].to_numpy(dtype=np.float64)
+        for timestamp, row in zip(times, values):
+            self.append(timestamp, dict(zip(columns, row)))
+
+    def _change(self, column, reference):
+        """Variation en % de la dernière année glissante par rapport à une moyenne de référence"""
+        if column not in self.latest or column not in reference:
+            return None
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return (np.float64(self.latest[column].value) / reference[column] - 1) * 100
+
+    @property
+    def current_value(self):
+        return self.buffers['Base_Value'].last
+
+    @property
+    def total_change(self):
+        return self._change('Base_Value', self.first)
+
+    @property
+    def recent_change(self):
+        # Année d'ancrage absente ou incomplète dans le flux: référence à la première année
+        return self._change('Base_Value', self.anchor or self.first)
+
+    @property
+    def current_risk(self):
+        return self.buffers['Risk_Level'].last if 'Risk_Level' in self.buffers else None
+
+    @property
+    def risk_class(self):
+        risk = self.current_risk
+        return classify_risk(risk) if risk is not None and not np.isnan(risk) else None
+
+    @property
+    def risk_label(self):
+        return RISK_LABELS.get(self.risk_class, "Inconnu")
+
+    @property
+    def risk_color(self):
+        return RISK_COLORS.get(self.risk_class, "#808080")
+
+    def frame(self):
+        """Contenu des tampons (du plus ancien au plus récent) en DataFrame, pour l'affichage"""
+        data = {'Date': self.times.values()}
+        data['Year'] = data['Date'].astype('datetime64[Y]').astype(np.int64) + 1970
+        for name, buffer in self.buffers.items():
+            data[name] = buffer.values()
+        data['Smoothed_Value'] = self.smoothed.values()
+        return pd.DataFrame(data)
+
+
+class LiveFeed:
+    """Flux en direct: fichier CSV en ajout seul, suivi comme `tail -f`
+
+    Chaque appel à `poll` lit les lignes complètes ajoutées depuis le précédent
+    (en un bloc, converti en une fois) et les passe au moniteur. Un fichier
+    tronqué ou remplacé est relu depuis le début. Le flux peut être partagé
+    entre sessions, d'où le verrou.
+    """
+
+    def __init__(self, path, **options):
+        self.path = path
+        self.options = options
+        self.monitor = LiveMonitor(**options)
+        self.offset = 0
+        self.header = None
+        self.last_poll = None
+        self._lock = threading.Lock()
+
+    def frame(self):
+        """Contenu des tampons, lu sans concurrence avec une ingestion en cours"""
+        with self._lock:
+            return self.monitor.frame()
+
+    def poll(self):
+        """Ingère les nouvelles lignes; retourne le nombre d'échantillons ajoutés"""
+        with self._lock:
+            self.last_poll = time.time()
+            if not os.path.exists(self.path):
+                return 0
+            if os.path.getsize(self.path) < self.offset:
+                self.offset, self.header = 0, None
+                self.monitor = LiveMonitor(**self.options)
+
+            with open(self.path, 'rb') as f:
+                f.seek(self.offset)
+                chunk = f.read()
+            end = chunk.rfind(b'\n') + 1
+            if end == 0:
+                return 0
+            self.offset += end
+            lines = chunk[:end]
+
+            if self.header is None:
+                header, _, lines = lines.partition(b'\n')
+                self.header = header.decode('utf-8').strip().split(',')
+            if not lines.strip():
+                return 0
+
+            records = pd.read_csv(io.BytesIO(lines), names=self.header, header=None)
+            records['Date'] = pd.to_datetime(records['Date'], errors='coerce')
+            records = records.dropna(subset=['Date'])
+            for name in records.columns.drop('Date'):
+                records[name] = pd.to_numeric(records[name], errors='coerce')
+            self.monitor.extend(records)
+            return len(records)
+
+
+def main():
+    """Alimente un flux en direct avec des données simulées (substitut d'un capteur)"""
+    from Earth import EarthDataAnalyzer
+
+    parser = argparse.ArgumentParser(description="Flux en direct simulé pour le mode direct du Dashboard")
+    parser.add_argument('data_type', nargs='?', default='temperature')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--resolution', default='daily', choices=['monthly', 'daily', 'hourly'])
+    parser.add_argument('--start-year', type=int, default=1990)
+    parser.add_argument('--rate', type=float, default=10.0, help="échantillons par seconde")
+    parser.add_argument('--backfill', type=int, default=1000, help="échantillons écrits d'emblée")
+    parser.add_argument('--output')
+    args = parser.parse_args()
+
+    analyzer = EarthDataAnalyzer(args.data_type, seed=args.seed, resolution=args.resolution)
+    analyzer.start_year = args.start_year
+    df = analyzer.generate_earth_data(columns=list(LIVE_COLUMNS))
+    path = args.output or live_feed_path(args.data_type)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    columns = ['Date'] + list(LIVE_COLUMNS)
+    rows = df.assign(Date=df['Date'].dt.strftime('%Y-%m-%dT%H:%M:%S'))[columns]
+    print(f"📡 Flux {args.data_type} -> {path} ({args.rate:g} échantillons/s)")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(','.join(columns) + '\n')
+        rows.iloc[:args.backfill].to_csv(f, header=False, index=False)
+        f.flush()
+        for row in rows.iloc[args.backfill:].itertuples(index=False):
+            f.write(','.join(map(str, row)) + '\n')
+            f.flush()
+            time.sleep(1 / args.rate)
+    print("✅ Fin du flux")
+
+
+if __name__ == "__main__":
+    main()
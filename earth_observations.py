@@ -0,0 +1,347 @@
+import glob
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from earth_export import HAS_ARROW
+
+if HAS_ARROW:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+
+OBSERVATION_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'observations')
+
+# Formats d'observations, par extension de fichier
+OBSERVATION_FORMATS = {
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.feather': 'feather',
+    '.arrow': 'feather',
+    '.nc': 'netcdf',
+}
+
+# Lignes lues par morceau (CSV, Parquet, Feather) et octets par morceau de grille (NetCDF)
+OBSERVATION_CHUNK_ROWS = 1_000_000
+OBSERVATION_CHUNK_BYTES = 64 * 2 ** 20
+
+# Colonnes temporelles reconnues sans manifeste (dates, ou années entières)
+TIME_COLUMNS = ('Date', 'date', 'time', 'Time', 'datetime', 'Year', 'year')
+
+# Colonnes exprimées dans l'unité du type de données; les autres sont sans dimension
+UNIT_COLUMNS = ('Base_Value', 'Seasonal_Min', 'Seasonal_Max', 'Smoothed_Value', 'Future_Projection')
+
+# Unité de datetime64 qui numérote les périodes de chaque résolution
+PERIOD_UNITS = {
+    'annual': 'Y',
+    'monthly': 'M',
+    'daily': 'D',
+    'hourly': 'h',
+}
+
+# Graphies usuelles des unités, ramenées à celles des configurations d'EarthDataAnalyzer
+UNIT_ALIASES = {
+    'c': '°C', 'degc': '°C', 'deg_c': '°C', 'celsius': '°C', '°c': '°C',
+    'k': 'K', 'kelvin': 'K',
+    'f': '°F', 'degf': '°F', 'deg_f': '°F', 'fahrenheit': '°F', '°f': '°F',
+    'mm/day': 'mm/jour', 'mm/d': 'mm/jour',
+    'mm/year': 'mm/an', 'mm/yr': 'mm/an',
+}
+
+# Conversions (unité source, unité cible) -> (facteur, décalage): cible = source * facteur + décalage
+UNIT_CONVERSIONS = {
+    ('K', '°C'): (1.0, -273.15),
+    ('°F', '°C'): (5 / 9, -160 / 9),
+    ('ppb', 'ppm'): (1e-3, 0.0),
+    ('cm', 'mm'): (10.0, 0.0),
+    ('m', 'mm'): (1000.0, 0.0),
+    ('mm/jour', 'mm/an'): (365.25, 0.0),
+}
+
+
+def list_observation_files(directory=OBSERVATION_DIR):
+    """Fichiers d'observations lisibles d'un dossier (les manifestes .json sont exclus)"""
+    paths = glob.glob(os.path.join(directory, '*'))
+    return sorted(path for path in paths if os.path.splitext(path)[1].lower() in OBSERVATION_FORMATS)
+
+
+def unit_conversion(source, target):
+    """(facteur, décalage) convertissant `source` en `target`; ValueError si impossible"""
+    source, target = _normalize_unit(source), _normalize_unit(target)
+    if source == target:
+        return 1.0, 0.0
+    if (source, target) not in UNIT_CONVERSIONS:
+        raise ValueError(f"Conversion d'unité non supportée: {source} -> {target}")
+    return UNIT_CONVERSIONS[(source, target)]
+
+
+def _normalize_unit(unit):
+    unit = str(unit).strip()
+    return UNIT_ALIASES.get(unit.lower(), unit)
+
+
+class ObservationSource:
+    """Fichier d'observations (stations, réanalyses) lu dans le schéma de generate_earth_data
+
+    Le fichier est lu par morceaux (CSV, groupes de lignes Parquet, lots Arrow,
+    tranches temporelles NetCDF); chaque morceau est converti en bloc (dates,
+    valeurs numériques, unités) puis réduit en sommes et effectifs par période
+    de la résolution demandée. Seuls ces agrégats restent en mémoire, si bien
+    que la taille du fichier n'est pas limitée par la RAM; plusieurs stations
+    d'une même période sont moyennées.
+
+    Un manifeste JSON facultatif, à côté du fichier (`<fichier>.json`), décrit
+    le fichier:
+
+        {"data_type": "temperature", "time": "date",
+         "columns": {"Base_Value": "tas"}, "units": {"Base_Value": "K"},
+         "na_values": [-999]}
+
+    Sans manifeste, la colonne temporelle est cherchée parmi TIME_COLUMNS et les
+    colonnes portant un nom du schéma (Base_Value...) sont lues telles quelles,
+    dans l'unité du type de données. Les grilles NetCDF (via xarray) sont
+    réduites à une moyenne pondérée par le cosinus de la latitude.
+    """
+
+    def __init__(self, path, manifest=None):
+        self.path = os.path.abspath(path)
+        self.format = OBSERVATION_FORMATS.get(os.path.splitext(path)[1].lower())
+        if self.format is None:
+            raise ValueError(f"Format d'observations inconnu: {path}")
+        if self.format in ('parquet', 'feather') and not HAS_ARROW:
+            raise ImportError(f"Le format {self.format} nécessite pyarrow (pip install pyarrow)")
+
+        self.manifest_path = self.path + '.json'
+        if manifest is None and os.path.exists(self.manifest_path):
+            with open(self.manifest_path, encoding='utf-8') as f:
+                manifest = json.load(f)
+        self.manifest = manifest or {}
+
+    def key(self):
+        """Identité du fichier et de son manifeste (chemin, date de modification, taille)"""
+        stat = os.stat(self.path)
+        manifest_mtime = os.stat(self.manifest_path).st_mtime_ns if os.path.exists(self.manifest_path) else None
+        return (self.path, stat.st_mtime_ns, stat.st_size, manifest_mtime)
+
+    def read(self, analyzer, chunk_rows=None):
+        """Observations agrégées à la résolution de l'analyseur, dans son schéma
+
+        Retourne un DataFrame Year (+ Date en infra-annuel) et colonnes observées,
+        une ligne par période observée; `df.attrs['ingest']` résume la lecture
+        (lignes lues et écartées, valeurs manquantes, conversions d'unités).
+        """
+        data_type = self.manifest.get('data_type', analyzer.data_type)
+        if data_type != analyzer.data_type:
+            raise ValueError(f"{os.path.basename(self.path)} contient des données {data_type}, "
+                             f"pas {analyzer.data_type}")
+
+        time_column, columns = self._resolve_columns(analyzer)
+        target_unit = analyzer.config['unit']
+        units = self._units(columns, target_unit)
+        conversions = {target: unit_conversion(source, target_unit) if target in UNIT_COLUMNS else (1.0, 0.0)
+                       for target, source in units.items()}
+        unit = PERIOD_UNITS[analyzer.resolution]
+
+        sums, counts = [], []
+        stats = {'rows': 0, 'dropped_rows': 0, 'missing': dict.fromkeys(columns, 0)}
+        for chunk in self._chunks(time_column, columns, chunk_rows or OBSERVATION_CHUNK_ROWS):
+            periods, valid = self._periods(chunk[time_column], unit)
+            stats['rows'] += len(chunk)
+            stats['dropped_rows'] += int((~valid).sum())
+
+            # Conversion en bloc: une opération vectorisée par colonne et par morceau
+            values = {}
+            for target, name in columns.items():
+                column = pd.to_numeric(chunk[name], errors='coerce').to_numpy(dtype=np.float64)[valid]
+                factor, offset = conversions[target]
+                if (factor, offset) != (1.0, 0.0):
+                    column = column * factor + offset
+                column[~np.isfinite(column)] = np.nan
+                stats['missing'][target] += int(np.isnan(column).sum())
+                values[target] = column
+
+            frame = pd.DataFrame(values)
+            keys = periods[valid].astype(np.int64)
+            sums.append(frame.groupby(keys).sum())
+            counts.append(frame.notna().groupby(keys).sum())
+
+        if not sums:
+            raise ValueError(f"Aucune observation lisible dans {os.path.basename(self.path)}")
+        total = pd.concat(sums).groupby(level=0).sum()
+        count = pd.concat(counts).groupby(level=0).sum()
+        means = total / count.where(count > 0)
+
+        df = self._to_schema(means, analyzer, unit)
+        stats['periods'] = len(df)
+        stats['units'] = {target: f"{units[target]} -> {target_unit}" for target in columns
+                          if target in UNIT_COLUMNS}
+        df.attrs['ingest'] = {'source': self.path, **stats}
+        return df
+
+    def _resolve_columns(self, analyzer):
+        """Colonne temporelle et correspondance {colonne du schéma: colonne du fichier}"""
+        available = self._available_columns()
+        schema = analyzer.schema() if hasattr(analyzer, 'schema') else {'Base_Value': np.float64}
+        known = [name for name in schema if name not in ('Year', 'Date')]
+
+        time_column = self.manifest.get('time') or next((name for name in TIME_COLUMNS if name in available), None)
+        if time_column is None or time_column not in available:
+            raise KeyError(f"Colonne temporelle introuvable dans {os.path.basename(self.path)}")
+
+        columns = self.manifest.get('columns') or {name: name for name in known if name in available}
+        unknown = [target for target in columns if target not in known]
+        if unknown:
+            raise ValueError(f"Colonnes hors du schéma: {', '.join(unknown)}")
+        missing = [name for name in columns.values() if name not in available]
+        if missing:
+            raise KeyError(f"Colonnes absentes de {os.path.basename(self.path)}: {', '.join(missing)}")
+        if not columns:
+            raise ValueError(f"Aucune colonne du schéma dans {os.path.basename(self.path)}")
+        return time_column, columns
+
+    def _units(self, columns, unit):
+        """Unité source de chaque colonne: manifeste, attributs NetCDF, sinon celle du type
+
+        Les colonnes sans dimension (indices, facteurs) n'acceptent pas d'unité.
+        """
+        declared = {**self._variable_units(columns), **self.manifest.get('units', {})}
+        units = {}
+        for target in columns:
+            if target in UNIT_COLUMNS:
+                units[target] = declared.get(target) or unit
+            elif target in self.manifest.get('units', {}):
+                raise ValueError(f"{target} est sans dimension: unité {declared[target]} refusée")
+            else:
+                units[target] = None
+        return units
+
+    def _periods(self, times, unit):
+        """Période (datetime64 à l'unité de la résolution) de chaque ligne, et masque des lignes datées"""
+        if pd.api.types.is_integer_dtype(times) or pd.api.types.is_float_dtype(times):
+            # Années entières: seule la résolution annuelle peut en être déduite
+            if unit != 'Y':
+                raise ValueError("Observations annuelles: résolution infra-annuelle impossible")
+            years = times.to_numpy(dtype=np.float64)
+            valid = np.isfinite(years)
+            return (np.where(valid, years, 1970) - 1970).astype(np.int64).astype('datetime64[Y]'), valid
+
+        dates = pd.to_datetime(times, format=self.manifest.get('time_format'), errors='coerce')
+        if dates.dt.tz is not None:
+            dates = dates.dt.tz_convert('UTC').dt.tz_localize(None)
+        periods = dates.to_numpy().astype(f'datetime64[{unit}]')
+        return periods, ~np.isnat(periods)
+
+    def _to_schema(self, means, analyzer, unit):
+        """DataFrame Year (+ Date) et colonnes observées, aux types du schéma de l'analyseur"""
+        schema = analyzer.schema() if hasattr(analyzer, 'schema') else {}
+        periods = means.index.to_numpy().astype(f'datetime64[{unit}]')
+        years = periods.astype('datetime64[Y]').astype(np.int64) + 1970
+
+        df = pd.DataFrame({'Year': years.astype(schema.get('Year', np.int64))})
+        if unit != 'Y':
+            df['Date'] = periods.astype(schema.get('Date', 'datetime64[ns]'))
+        for name in means.columns:
+            dtype = schema.get(name, np.float64)
+            df[name] = means[name].to_numpy().astype(np.float64 if isinstance(dtype, str) else dtype)
+        return df
+
+    def _available_columns(self):
+        if self.format == 'csv':
+            return list(pd.read_csv(self.path, nrows=0).columns)
+        if self.format == 'parquet':
+            return pq.read_schema(self.path).names
+        if self.format == 'feather':
+            with pa.memory_map(self.path) as source:
+                return pa.ipc.open_file(source).schema.names
+        with _import_xarray().open_dataset(self.path) as ds:
+            return list(ds.variables)
+
+    def _variable_units(self, columns):
+        """Unités déclarées dans les attributs des variables NetCDF"""
+        if self.format != 'netcdf':
+            return {}
+        with _import_xarray().open_dataset(self.path) as ds:
+            return {target: ds[name].attrs['units'] for target, name in columns.items()
+                    if 'units' in ds[name].attrs}
+
+    def _chunks(self, time_column, columns, chunk_rows):
+        """Morceaux bruts (DataFrames) limités à la colonne temporelle et aux colonnes lues"""
+        names = [time_column] + [name for name in columns.values() if name != time_column]
+        if self.format == 'csv':
+            yield from pd.read_csv(self.path, usecols=names, chunksize=chunk_rows,
+                                   na_values=self.manifest.get('na_values'))
+        elif self.format == 'parquet':
+            for batch in pq.ParquetFile(self.path).iter_batches(batch_size=chunk_rows, columns=names):
+                yield batch.to_pandas()
+        elif self.format == 'feather':
+            with pa.memory_map(self.path) as source:
+                reader = pa.ipc.open_file(source)
+                for i in range(reader.num_record_batches):
+                    yield reader.get_batch(i).select(names).to_pandas()
+        else:
+            yield from self._netcdf_chunks(time_column, columns)
+
+    def _netcdf_chunks(self, time_column, columns):
+        """Tranches temporelles d'une grille, réduites à leur moyenne spatiale"""
+        with _import_xarray().open_dataset(self.path) as ds:
+            n_times = ds.sizes[time_column]
+            # Pas de temps par tranche: OBSERVATION_CHUNK_BYTES de float64 pour toutes les variables
+            step_bytes = 8 * sum(ds[name].size for name in columns.values()) // max(n_times, 1)
+            step = max(OBSERVATION_CHUNK_BYTES // max(step_bytes, 1), 1)
+            for start in range(0, n_times, step):
+                part = ds.isel({time_column: slice(start, start + step)})
+                data = {time_column: part[time_column].to_numpy()}
+                for name in columns.values():
+                    data[name] = _spatial_mean(part[name], time_column)
+                yield pd.DataFrame(data)
+
+
+def _spatial_mean(variable, time_column):
+    """Moyenne par pas de temps sur les autres dimensions, pondérée par cos(latitude)"""
+    other = [dim for dim in variable.dims if dim != time_column]
+    values = variable.transpose(time_column, *other).to_numpy().astype(np.float64)
+    weights = np.ones(values.shape[1:])
+    for axis, dim in enumerate(other):
+        if dim in ('lat', 'latitude'):
+            shape = [1] * len(other)
+            shape[axis] = -1
+            weights = weights * np.cos(np.deg2rad(variable[dim].to_numpy())).reshape(shape)
+    values = values.reshape(len(values), -1)
+    weights = np.broadcast_to(weights, values.shape[1:]).ravel()
+    valid = ~np.isnan(values)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(valid, values, 0.0) @ weights / (valid @ weights)
+
+
+def _import_xarray():
+    try:
+        import xarray
+    except ImportError:
+        raise ImportError("Le format NetCDF nécessite xarray (pip install xarray netCDF4)") from None
+    return xarray
+
+
+def overlay_observations(df, observed):
+    """Remplace les colonnes simulées par les colonnes observées, sur la période observée
+
+    Le jeu de données est restreint aux périodes comprises entre la première et
+    la dernière observation; les colonnes non observées restent simulées et les
+    périodes manquantes à l'intérieur de l'intervalle restent NaN.
+    """
+    key = 'Date' if 'Date' in df.columns else 'Year'
+    observed_index = observed.set_index(key)
+    first, last = observed_index.index.min(), observed_index.index.max()
+    df = df[(df[key] >= first) & (df[key] <= last)].reset_index(drop=True)
+    if df.empty:
+        raise ValueError(f"Aucune observation entre {first} et {last} dans la période simulée")
+
+    columns = [name for name in observed.columns if name not in ('Year', 'Date')]
+    aligned = observed_index[columns].reindex(df[key].to_numpy())
+    for name in columns:
+        values = aligned[name].to_numpy()
+        keep_dtype = name in df.columns and df[name].dtype != 'category'
+        df[name] = values.astype(df[name].dtype) if keep_dtype else values
+    df.attrs['observations'] = {**observed.attrs.get('ingest', {}), 'columns': columns}
+    return df
@@ -0,0 +1,453 @@
+import contextlib
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from earth_cache import EarthDataCache
+from earth_events import CLIMATE_EVENTS
+from earth_summary import EarthSummary
+
+DEFAULT_REPORT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'reports')
+
+# Mise en page du rapport; REPORT_VERSION est à incrémenter à chaque modification
+# des tracés, pour invalider les rapports déjà rendus
+REPORT_VERSION = 3
+REPORT_FIGSIZE = (20, 28)
+REPORT_STYLE = 'seaborn-v0_8'
+REPORT_DPI = 150
+REPORT_FORMATS = ('png',)
+
+
+class EarthReport:
+    """Rapport matplotlib et insights texte d'un jeu de données EarthDataAnalyzer
+
+    Séparé du cœur de simulation: matplotlib n'est importé qu'au moment de
+    tracer le rapport, si bien que ni le dashboard ni les traitements batch
+    ne paient son coût d'import.
+    """
+    
+    def __init__(self, analyzer):
+        self.analyzer = analyzer
+        self.data_type = analyzer.data_type
+        self.config = analyzer.config
+        self.start_year = analyzer.start_year
+        self.end_year = analyzer.end_year
+    
+    def create_earth_analysis(self, df, dpi=REPORT_DPI, show=True):
+        """Crée une analyse complète des données terrestres
+        
+        Le fichier PNG est écrit comme par `render_report` (même gabarit, même
+        résolution); `show` affiche ensuite la figure dans une fenêtre pyplot.
+        """
+        # Import différé: matplotlib n'est chargé que pour produire le rapport
+        import matplotlib.pyplot as plt
+        
+        plt.style.use(REPORT_STYLE)  # Style clair pour les données terrestres
+        template = ReportTemplate(plt.figure(figsize=REPORT_FIGSIZE))
+        template.update(self, df)
+        template.save(f'earth_{self.data_type}_analysis.png', 'png', dpi)
+        if show:
+            plt.show()
+        plt.close(template.fig)
+        
+        # Générer les insights
+        self.generate_insights(df)
+    
+    def render_report(self, df, output_dir, formats=('png',), dpi=REPORT_DPI, template=None):
+        """Rend le rapport sans affichage (backend Agg, sans pyplot) dans chaque format
+        
+        Retourne la liste des fichiers écrits. Passer le même `template` d'un
+        rapport à l'autre évite de reconstruire la figure à chaque fois.
+        """
+        template = template or ReportTemplate()
+        template.update(self, df)
+        
+        os.makedirs(output_dir, exist_ok=True)
+        paths = []
+        for fmt in formats:
+            path = os.path.join(output_dir, f'earth_{self.data_type}_analysis.{fmt}')
+            template.save(path, fmt, dpi)
+            paths.append(path)
+        return paths
+    
+    def generate_insights(self, df):
+        """Génère des insights analytiques sur les données terrestres"""
+        print(f"🌍 INSIGHTS ANALYTIQUES - {self.config['description']}")
+        print("=" * 70)
+        
+        # Statistiques de synthèse partagées avec le dashboard
+        summary = EarthSummary(df)
+        
+        # 1. Statistiques de base
+        print("\n1. 📊 STATISTIQUES FONDAMENTALES:")
+        print(f"Valeur moyenne: {summary.mean_value:.2f} {self.config['unit']}")
+        print(f"Valeur maximale: {summary.max_value:.2f} {self.config['unit']}")
+        print(f"Valeur minimale: {summary.min_value:.2f} {self.config['unit']}")
+        print(f"Valeur actuelle: {summary.current_value:.2f} {self.config['unit']}")
+        
+        # 2. Analyse des tendances
+        print("\n2. 📈 ANALYSE DES TENDANCES:")
+        print(f"Changement total depuis {summary.start_year}: {summary.total_change:+.1f}%")
+        print(f"Changement depuis {summary.anchor_year}: {summary.recent_change:+.1f}%")
+        print(f"Tendance principale: {self.config['trend']}")
+        
+        # 3. Risque environnemental
+        print("\n3. ⚠️  RISQUE ENVIRONNEMENTAL:")
+        print(f"Niveau de risque actuel: {summary.current_risk:.1f}/100")
+        print(f"Évolution du risque depuis {summary.anchor_year}: {summary.risk_change:+.1f}%")
+        print(f"→ Niveau de risque {summary.risk_label.upper()}")
+        
+        # 4. Événements majeurs
+        print("\n4. 🌪️  ÉVÉNEMENTS CLIMATIQUES MARQUANTS:")
+        for event in CLIMATE_EVENTS.events.itertuples():
+            period = f"{event.start}" if event.start == event.end else f"{event.start}-{event.end}"
+            print(f"• {period}: {event.label}")
+        
+        # 5. Impact humain
+        print("\n5. 👥 IMPACT HUMAIN:")
+        print(f"Facteur d'impact humain actuel: {summary.human_impact:.1f}x")
+        print(f"Augmentation depuis {summary.start_year}: {summary.human_growth:+.0f}%")
+        
+        # 6. Projections futures
+        print("\n6. 🔮 PROJECTIONS FUTURES:")
+        print(f"Changement projeté d'ici 2025: {summary.future_change:+.1f}%")
+        
+        if self.config["trend"] == "croissante":
+            print("→ Tendance à la hausse prévue")
+        elif self.config["trend"] == "décroissante":
+            print("→ Tendance à la baisse prévue")
+        else:
+            print("→ Stabilité relative prévue")
+        
+        # 7. Implications environnementales
+        print("\n7. 🎯 IMPLICATIONS ENVIRONNEMENTALES:")
+        if self.data_type == "temperature":
+            print("• Impact direct sur les écosystèmes")
+            print("• Risque d'événements extrêmes accru")
+            print("• Implications pour la sécurité alimentaire")
+        
+        elif self.data_type == "co2":
+            print("• Principal facteur du changement climatique")
+            print("• Acidification des océans")
+            print("• Impact sur la photosynthèse")
+        
+        elif self.data_type == "sea_level":
+            print("• Menace pour les zones côtières")
+            print("• Déplacement des populations")
+            print("• Perte de territoires")
+        
+        elif self.data_type == "biodiversity":
+            print("• Effondrement des écosystèmes")
+            print("• Perte de services écosystémiques")
+            print("• Risque pour la sécurité alimentaire")
+        
+        print("• Nécessité d'actions d'atténuation")
+        print("• Importance de l'adaptation climatique")
+        print("• Enjeu de gouvernance mondiale")
+
+
+
+def report_time_axis(df):
+    """Abscisses du rapport: l'année, ou l'année décimale tirée de Date en résolution infra-annuelle"""
+    if 'Date' not in df.columns:
+        return df['Year'].to_numpy()
+    dates = pd.DatetimeIndex(df['Date'])
+    days_in_year = np.where(dates.is_leap_year, 366.0, 365.0)
+    return dates.year + (np.asarray(dates.dayofyear) - 1 + np.asarray(dates.hour) / 24) / days_in_year
+
+
+class ReportTemplate:
+    """Figure du rapport (dix panneaux) construite une seule fois et mise à jour sur place
+    
+    La mise en page, le style des axes, les légendes, la barre de couleur et les
+    repères fixes sont créés à la construction; `update` ne fait que remplacer les
+    données des artistes (`set_data`, `set_offsets`, hauteurs des barres), les
+    textes dépendant du type de données et les limites des axes. Le rendu est
+    identique à celui d'une figure neuve pour un coût bien moindre par rapport.
+    Sans figure fournie, une figure sans pyplot rattachée au backend Agg est créée.
+    """
+    
+    def __init__(self, fig=None):
+        from matplotlib import style
+        
+        with style.context(REPORT_STYLE):
+            if fig is None:
+                from matplotlib.backends.backend_agg import FigureCanvasAgg
+                from matplotlib.figure import Figure
+                
+                fig = Figure(figsize=REPORT_FIGSIZE)
+                FigureCanvasAgg(fig)
+            self.fig = fig
+            self._build()
+    
+    def _style_axes(self, ax, title, ylabel, legend=False):
+        """Style commun des panneaux"""
+        ax.set_title(title, fontsize=12, fontweight='bold', color='darkblue')
+        ax.set_ylabel(ylabel, color='darkblue')
+        if legend:
+            ax.legend()
+        ax.grid(True, alpha=0.3, color='gray')
+        ax.set_facecolor('lightcyan')
+        ax.tick_params(colors='darkblue')
+    
+    def _build(self):
+        """Crée les axes, les artistes (sans données) et leur style"""
+        fig = self.fig
+        self.axes = [fig.add_subplot(5, 2, i) for i in range(1, 11)]
+        (ax_primary, ax_trends, ax_seasonal, ax_impact, ax_cycle,
+         ax_smoothed, ax_risk, ax_extreme, ax_index, ax_future) = self.axes
+        
+        # 1. Données principales (repères de décennies masqués hors de la période)
+        self.primary, = ax_primary.plot([], [], label='Valeur observée', 
+                                        linewidth=2, color='#1E90FF', alpha=0.9)
+        ax_primary.set_title('', fontsize=12, fontweight='bold', color='darkblue')
+        ax_primary.set_ylabel('', color='#1E90FF')
+        ax_primary.tick_params(axis='y', labelcolor='#1E90FF')
+        ax_primary.grid(True, alpha=0.3, color='gray')
+        ax_primary.set_facecolor('lightcyan')
+        self.decades = {year: ax_primary.axvline(x=year, alpha=0.2, color='blue', linestyle='--')
+                        for year in range(1850, 2026, 10)}
+        
+        # 2. Tendances climatiques
+        self.trend, = ax_trends.plot([], [], label='Tendance climatique', 
+                                     linewidth=2, color='#FF4500')
+        self.trend_impact, = ax_trends.plot([], [], label='Impact humain', 
+                                            linewidth=2, color='#8A2BE2')
+        self._style_axes(ax_trends, 'Tendances Climatiques et Impact Humain',
+                         'Facteur multiplicatif', legend=True)
+        
+        # 3. Variations saisonnières
+        self.seasonal_min, = ax_seasonal.plot([], [], label='Minimum saisonnier', 
+                                              color='#1E90FF', alpha=0.7)
+        self.seasonal_max, = ax_seasonal.plot([], [], label='Maximum saisonnier', 
+                                              color='#FF6347', alpha=0.7)
+        self._style_axes(ax_seasonal, 'Variations Saisonnières', 'Facteur d\'amplitude', legend=True)
+        
+        # 4. Impact humain
+        self.impact_fill = ax_impact.fill_between([], [], alpha=0.6, 
+                                                  color='#8A2BE2', label='Impact humain')
+        self._style_axes(ax_impact, 'Impact des Activités Humaines', 'Niveau d\'impact')
+        
+        # 5. Cycle annuel (la barre de couleur suit la normalisation du nuage de points)
+        self.cycle = ax_cycle.scatter([0, 1], [0, 1], c=[0, 1], cmap='viridis', alpha=0.7, s=30)
+        ax_cycle.set_title('Cycle Annuel (0-1)', fontsize=12, fontweight='bold', color='darkblue')
+        ax_cycle.set_ylabel('Phase du cycle', color='darkblue')
+        ax_cycle.set_xlabel('Année', color='darkblue')
+        fig.colorbar(self.cycle, ax=ax_cycle, label='Phase annuelle')
+        ax_cycle.grid(True, alpha=0.3, color='gray')
+        ax_cycle.set_facecolor('lightcyan')
+        ax_cycle.tick_params(colors='darkblue')
+        
+        # 6. Données lissées
+        self.smoothed_raw, = ax_smoothed.plot([], [], label='Données brutes', 
+                                              alpha=0.5, color='#1E90FF')
+        self.smoothed, = ax_smoothed.plot([], [], label='Données lissées (10 ans)', 
+                                          linewidth=2, color='#32CD32')
+        self._style_axes(ax_smoothed, 'Données Brutes vs Lissées', '', legend=True)
+        
+        # 7. Niveau de risque (échelle fixe 0-100)
+        self.risk_fill = ax_risk.fill_between([], [], alpha=0.6, 
+                                              color='#FF4500', label='Niveau de risque')
+        self.risk, = ax_risk.plot([], [], color='#8B0000', alpha=0.8)
+        self._style_axes(ax_risk, 'Niveau de Risque Environnemental (0-100)', 'Niveau de risque')
+        ax_risk.set_ylim(0, 100)
+        
+        # 8. Événements extrêmes (barres créées à la première mise à jour)
+        self.extreme_bars = None
+        self._style_axes(ax_extreme, 'Événements Climatiques Extrêmes', 'Intensité relative')
+        
+        # 9. Indice environnemental
+        self.index, = ax_index.plot([], [], label='Indice environnemental', 
+                                    linewidth=2, color='#2E8B57')
+        self._style_axes(ax_index, 'Indice Environnemental Composite', 'Valeur de l\'indice')
+        
+        # 10. Projections futures
+        self.future_raw, = ax_future.plot([], [], label='Données historiques', 
+                                          color='#1E90FF', alpha=0.7)
+        self.future, = ax_future.plot([], [], label='Projections futures', 
+                                      linewidth=2, color='#FF8C00', linestyle='--')
+        ax_future.axvline(x=2020, color='red', linestyle=':', alpha=0.7, label='Début des projections')
+        self._style_axes(ax_future, 'Données Historiques et Projections Futures', '', legend=True)
+    
+    def update(self, report, df):
+        """Remplace les données et les textes de la figure par ceux d'un nouveau jeu de données
+        
+        L'axe des abscisses est en années décimales (voir `report_time_axis`), si
+        bien que les repères de décennies et de 2020 restent valables quelle que
+        soit la résolution.
+        """
+        from matplotlib import style
+        
+        years = df['Year'].to_numpy()
+        x = report_time_axis(df)
+        (ax_primary, ax_trends, ax_seasonal, ax_impact, ax_cycle,
+         ax_smoothed, ax_risk, ax_extreme, ax_index, ax_future) = self.axes
+        
+        with style.context(REPORT_STYLE):
+            # Textes propres au type de données
+            ax_primary.title.set_text(f'Données Principales - {report.config["description"]}')
+            for ax in (ax_primary, ax_smoothed, ax_future):
+                ax.yaxis.label.set_text(report.config["unit"])
+            self.fig.suptitle(f'Analyse des Données Terrestres: {report.config["description"]} '
+                              f'({report.start_year}-{report.end_year})', 
+                              fontsize=16, fontweight='bold', color='darkblue')
+            
+            # Données des artistes
+            self.primary.set_data(x, df['Base_Value'])
+            for year, line in self.decades.items():
+                line.set_visible(years[0] <= year <= years[-1])
+            self.trend.set_data(x, df['Climate_Trend'])
+            self.trend_impact.set_data(x, df['Human_Impact'])
+            self.seasonal_min.set_data(x, df['Seasonal_Min'])
+            self.seasonal_max.set_data(x, df['Seasonal_Max'])
+            self.impact_fill.set_data(x, df['Human_Impact'], 0)
+            cycle = df['Annual_Cycle'].to_numpy(dtype=np.float64)
+            self.cycle.set_offsets(np.column_stack((x, cycle)))
+            self.cycle.set_array(cycle)
+            self.cycle.set_clim(np.nanmin(cycle), np.nanmax(cycle))
+            self.smoothed_raw.set_data(x, df['Base_Value'])
+            self.smoothed.set_data(x, df['Smoothed_Value'])
+            self.risk_fill.set_data(x, df['Risk_Level'], 0)
+            self.risk.set_data(x, df['Risk_Level'])
+            # Une barre par année: moyenne annuelle en résolution infra-annuelle
+            extremes = df.groupby('Year', sort=True)['Extreme_Events'].mean()
+            self._update_bars(ax_extreme, extremes.index.to_numpy(), extremes.to_numpy())
+            self.index.set_data(x, df['Environmental_Index'])
+            self.future_raw.set_data(x, df['Base_Value'])
+            self.future.set_data(x, df['Future_Projection'])
+            
+            # Limites des axes recalculées comme lors d'un premier tracé
+            for ax in self.axes:
+                ax.relim(visible_only=True)
+                for collection in ax.collections:
+                    ax.update_datalim(collection.get_datalim(ax.transData).get_points())
+                ax.autoscale_view()
+            self.fig.tight_layout()
+    
+    def _update_bars(self, ax, years, values):
+        """Met à jour les barres sur place (recréées seulement si leur nombre change)"""
+        if self.extreme_bars is not None and len(self.extreme_bars) == len(years):
+            for bar, year, value in zip(self.extreme_bars, years, values):
+                bar.set_x(year - bar.get_width() / 2)
+                bar.set_height(value)
+            return
+        if self.extreme_bars is not None:
+            self.extreme_bars.remove()
+        self.extreme_bars = ax.bar(years, values, alpha=0.6, 
+                                   color='#FF6347', label='Intensité des événements extrêmes')
+    
+    def save(self, path, fmt=None, dpi=REPORT_DPI):
+        """Écrit la figure dans un fichier (format déduit de l'extension par défaut)"""
+        from matplotlib import style
+        
+        with style.context(REPORT_STYLE):
+            self.fig.savefig(path, format=fmt, dpi=dpi, bbox_inches='tight',
+                             facecolor='white', edgecolor='none')
+
+def render_all_reports(types=None, output_dir=DEFAULT_REPORT_DIR, formats=REPORT_FORMATS,
+                       dpi=REPORT_DPI, seed=42, resolution='annual', workers=None, force=False):
+    """Rend le rapport de chaque type de données en parallèle (un processus par type)
+    
+    Chaque rapport est accompagné d'un fichier d'insights texte et d'un manifeste
+    JSON contenant l'empreinte de ses entrées (paramètres du jeu de données,
+    version du générateur et du rapport, formats, DPI). Un type dont l'empreinte
+    n'a pas changé et dont les fichiers existent n'est pas re-rendu (sauf `force`).
+    Retourne un DataFrame avec le statut et la durée de rendu de chaque type.
+    """
+    from Earth import EARTH_DATA_TYPES
+    
+    types = list(types or EARTH_DATA_TYPES)
+    jobs = [(data_type, output_dir, tuple(formats), dpi, seed, resolution, force)
+            for data_type in types]
+    if workers == 1 or len(jobs) == 1:
+        results = [_render_job(job) for job in jobs]
+    else:
+        workers = workers or min(len(jobs), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_render_job, jobs))
+    
+    return pd.DataFrame(results, columns=['Data_Type', 'Status', 'Seconds', 'Files'])
+
+def report_inputs_hash(analyzer, formats, dpi):
+    """Empreinte des entrées qui déterminent les fichiers d'un rapport"""
+    payload = {
+        'data': EarthDataCache().key(analyzer),
+        'report_version': REPORT_VERSION,
+        'formats': list(formats),
+        'dpi': dpi,
+    }
+    encoded = json.dumps(payload, sort_keys=True)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+# Gabarit de rapport propre à chaque processus, réutilisé d'un type de données à l'autre
+_TEMPLATE = None
+
+def _worker_template():
+    """Gabarit du processus courant, construit au premier rendu"""
+    global _TEMPLATE
+    if _TEMPLATE is None:
+        _TEMPLATE = ReportTemplate()
+    return _TEMPLATE
+
+def _render_job(args):
+    """Rend le rapport d'un type de données dans un processus du pool"""
+    from Earth import EarthDataAnalyzer
+    
+    data_type, output_dir, formats, dpi, seed, resolution, force = args
+    start = time.perf_counter()
+    analyzer = EarthDataAnalyzer(data_type, seed=seed, resolution=resolution)
+    inputs_hash = report_inputs_hash(analyzer, formats, dpi)
+    
+    manifest_path = os.path.join(output_dir, f'earth_{data_type}_analysis.json')
+    if not force and os.path.exists(manifest_path):
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('inputs_hash') == inputs_hash and all(map(os.path.exists, manifest['files'])):
+            return data_type, 'skipped', time.perf_counter() - start, manifest['files']
+    
+    report = EarthReport(analyzer)
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        df = EarthDataCache().get_or_generate(analyzer)
+    files = report.render_report(df, output_dir, formats, dpi, template=_worker_template())
+    
+    # Les insights vont dans un fichier texte plutôt que sur la sortie standard
+    insights_path = os.path.join(output_dir, f'earth_{data_type}_insights.txt')
+    with open(insights_path, 'w', encoding='utf-8') as f, contextlib.redirect_stdout(f):
+        report.generate_insights(df)
+    files.append(insights_path)
+    
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump({'inputs_hash': inputs_hash, 'files': files}, f, indent=2)
+    return data_type, 'rendered', time.perf_counter() - start, files
+
+def main():
+    """Rendu batch (sans affichage) des rapports de tous les types de données"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Rendu batch des rapports matplotlib")
+    parser.add_argument('--types', nargs='+', help="types de données (défaut: tous)")
+    parser.add_argument('--output', default=DEFAULT_REPORT_DIR, help="dossier de sortie")
+    parser.add_argument('--formats', nargs='+', default=list(REPORT_FORMATS),
+                        help="formats de fichier (png, pdf, svg...)")
+    parser.add_argument('--dpi', type=int, default=REPORT_DPI)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--resolution', default='annual')
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--force', action='store_true', help="re-rendre même si rien n'a changé")
+    args = parser.parse_args()
+    
+    print(f"🖼️  Rendu des rapports dans {args.output} ({', '.join(args.formats)}, {args.dpi} dpi)")
+    results = render_all_reports(args.types, args.output, args.formats, args.dpi, args.seed,
+                                 args.resolution, args.workers, args.force)
+    for row in results.itertuples():
+        icon = "⏭️ " if row.Status == 'skipped' else "✅"
+        print(f"{icon} {row.Data_Type:<15} {row.Status:<9} {row.Seconds:6.2f} s")
+    print(f"⏱️  Total: {results['Seconds'].sum():.2f} s (cumul des processus)")
+
+if __name__ == "__main__":
+    main()
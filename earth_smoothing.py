@@ -0,0 +1,178 @@
+import numpy as np
+
+# Noyaux de lissage disponibles
+KERNELS = ('boxcar', 'gaussian', 'loess')
+
+
+def _window_bounds(n, window, center=True):
+    """Bornes [start, stop) de la fenêtre de chaque point, tronquées à la série"""
+    idx = np.arange(n)
+    start = idx - window // 2 if center else idx - window + 1
+    stop = start + window
+    return np.clip(start, 0, n), np.clip(stop, 0, n)
+
+
+def _prefix(values):
+    """Sommes cumulées préfixées d'un zéro (somme de [a, b) = p[b] - p[a])"""
+    return np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+
+
+def moving_average(values, window, center=True, min_periods=None):
+    """Moyenne mobile en O(n) par sommes préfixes, en ignorant les NaN
+
+    Fenêtres identiques à `pandas.Series.rolling(window, center=center)`: le
+    résultat est NaN quand la fenêtre compte moins de `min_periods` valeurs
+    valides (par défaut `window`, comme pandas).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    min_periods = window if min_periods is None else min_periods
+    valid = ~np.isnan(values)
+
+    start, stop = _window_bounds(len(values), window, center)
+    sums = _prefix(np.where(valid, values, 0.0))
+    counts = _prefix(valid)
+    total = sums[stop] - sums[start]
+    count = counts[stop] - counts[start]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        result = total / count
+    result[count < max(min_periods, 1)] = np.nan
+    return result
+
+
+def _box_widths(window):
+    """Largeurs des trois boîtes du lissage gaussien, de support total `window`
+
+    Trois boîtes de largeurs a, b, c couvrent a + b + c - 2 points; les largeurs
+    sont réparties aussi également que possible (noyau le plus proche d'une
+    gaussienne à support donné, d'écart-type voisin de window/5).
+    """
+    q, r = divmod(window + 2, 3)
+    return [q + 1] * r + [q] * (3 - r)
+
+
+def _box_mean(values, width, shift, center=True):
+    """Moyenne mobile d'une largeur donnée, renormalisée aux bords (NaN ignorés)
+
+    Une boîte centrée de largeur paire est décalée d'un demi-pas: vers le passé
+    (`shift=0`) ou vers le futur (`shift=1`).
+    """
+    n = len(values)
+    idx = np.arange(n)
+    start = idx - (width - shift) // 2 if center else idx - width + 1
+    start, stop = np.clip(start, 0, n), np.clip(start + width, 0, n)
+    valid = ~np.isnan(values)
+    sums = _prefix(np.where(valid, values, 0.0))
+    counts = _prefix(valid)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (sums[stop] - sums[start]) / (counts[stop] - counts[start])
+
+
+def gaussian_smooth(values, window, center=True, min_periods=None):
+    """Lissage quasi gaussien: trois moyennes mobiles successives (O(n))
+
+    Les largeurs des trois boîtes sont tirées de `window` (voir `_box_widths`):
+    le noyau obtenu couvre exactement les `window` points de la fenêtre d'une
+    moyenne mobile de même largeur. Les boîtes paires sont décalées d'un
+    demi-pas alternativement vers le passé et vers le futur.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    min_periods = window if min_periods is None else min_periods
+    result = values
+    shift = 0
+    for width in _box_widths(window):
+        result = _box_mean(result, width, shift, center)
+        if width % 2 == 0:
+            shift = 1 - shift
+
+    start, stop = _window_bounds(len(values), window, center)
+    counts = _prefix(~np.isnan(values))
+    result[counts[stop] - counts[start] < max(min_periods, 1)] = np.nan
+    return result
+
+
+def _correlate(arrays, kernels, offset):
+    """Produits de corrélation `out[i] = sum_m k[m] * a[i + offset + m]` (zéros hors série)
+
+    Retourne la liste des résultats pour chaque couple (tableau, noyau) de
+    `zip(arrays, kernels)`. Les noyaux courts passent par np.convolve, les longs
+    par FFT (les transformées de chaque tableau et noyau sont partagées).
+    """
+    n, width = len(arrays[0]), len(kernels[0])
+    lo = width - 1 + offset
+    reversed_kernels = {id(k): k[::-1] for k in kernels}
+    if width <= 64:
+        return [np.convolve(a, reversed_kernels[id(k)])[lo:lo + n] for a, k in zip(arrays, kernels)]
+
+    # Transformées calculées une fois par tableau et par noyau distincts
+    size = 1 << (n + width - 2).bit_length()
+    spectra = {key: np.fft.rfft(k, size) for key, k in reversed_kernels.items()}
+    for a in arrays:
+        if id(a) not in spectra:
+            spectra[id(a)] = np.fft.rfft(a, size)
+    return [np.fft.irfft(spectra[id(a)] * spectra[id(k)], size)[lo:lo + n]
+            for a, k in zip(arrays, kernels)]
+
+
+def loess_smooth(values, window, center=True, min_periods=None):
+    """Régression linéaire locale pondérée (LOESS, poids tricubes)
+
+    Chaque point est estimé par une droite ajustée sur sa fenêtre, les voisins
+    étant pondérés par (1 - |d/h|³)³ selon leur distance d (h: demi-largeur de
+    la fenêtre plus un pas, si bien que tous les points ont un poids non nul).
+    Les sommes pondérées sont des corrélations avec des noyaux fixes, obtenues
+    par FFT pour les grandes fenêtres (O(n log n)).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    min_periods = window if min_periods is None else min_periods
+    valid = (~np.isnan(values)).astype(np.float64)
+    y = np.where(valid > 0, values, 0.0)
+
+    offset = -(window // 2) if center else -(window - 1)
+    d = np.arange(offset, offset + window, dtype=np.float64)
+    h = np.abs(d).max() + 1
+    weights = (1 - (np.abs(d) / h) ** 3) ** 3
+    wd, wdd = weights * d, weights * d * d
+
+    s0, s1, s2, t0, t1 = _correlate([valid, valid, valid, y, y],
+                                    [weights, wd, wdd, weights, wd], offset)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        det = s0 * s2 - s1 * s1
+        # Ajustement dégénéré (un seul point valide): moyenne pondérée
+        result = np.where(det > 1e-9 * s0 * s2, (s2 * t0 - s1 * t1) / det, t0 / s0)
+
+    start, stop = _window_bounds(n, window, center)
+    counts = _prefix(valid)
+    result[counts[stop] - counts[start] < max(min_periods, 1)] = np.nan
+    return result
+
+
+def smooth(values, window, kernel='boxcar', center=True, min_periods=None):
+    """Lisse une série avec le noyau demandé ('boxcar', 'gaussian' ou 'loess')"""
+    if kernel == 'boxcar':
+        return moving_average(values, window, center, min_periods)
+    if kernel == 'gaussian':
+        return gaussian_smooth(values, window, center, min_periods)
+    if kernel == 'loess':
+        return loess_smooth(values, window, center, min_periods)
+    raise ValueError(f"Noyau de lissage inconnu: {kernel}")
+
+
+class SmoothingTable:
+    """Séries lissées précalculées pour un ensemble de largeurs de fenêtre
+
+    Chaque fenêtre est calculée une seule fois; `table[window]` est ensuite
+    une simple consultation, par exemple à chaque mouvement d'un curseur.
+    """
+
+    def __init__(self, values, windows=range(1, 21), kernel='boxcar', center=True, min_periods=None):
+        self.kernel = kernel
+        self.series = {window: smooth(values, window, kernel, center, min_periods)
+                       for window in windows}
+
+    def __getitem__(self, window):
+        return self.series[window]
+
+    def __contains__(self, window):
+        return window in self.series
@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+
+# Seuils de classification du niveau de risque (0-100)
+RISK_THRESHOLDS = {"high": 70, "moderate": 40}
+RISK_LABELS = {"high": "Élevé", "moderate": "Modéré", "low": "Faible"}
+RISK_COLORS = {"high": "#DC143C", "moderate": "#FF8C00", "low": "#2E8B57"}
+
+# Catégories du graphique radar et colonne normalisée correspondante
+RADAR_COLUMNS = {
+    'Tendance': 'Climate_Trend',
+    'Impact Humain': 'Human_Impact',
+    'Événements Extrêmes': 'Extreme_Events',
+}
+
+
+def classify_risk(risk):
+    """Classe un niveau de risque: 'high', 'moderate' ou 'low'"""
+    if risk > RISK_THRESHOLDS["high"]:
+        return "high"
+    if risk > RISK_THRESHOLDS["moderate"]:
+        return "moderate"
+    return "low"
+
+
+class EarthSummary:
+    """Statistiques de synthèse d'un jeu de données, calculées une seule fois
+
+    Toutes les colonnes numériques sont réduites en une passe (min, max,
+    moyenne, dernière valeur, moyennes des années de référence); les
+    indicateurs dérivés (variations, scores radar, classe de risque) en
+    découlent. Les colonnes absentes du jeu de données donnent None.
+    Les variations comparent des moyennes sur une année glissante (la
+    dernière, celle de l'année d'ancrage et la première, toutes terminées au
+    même mois et au même jour): en résolution infra-annuelle, elles ne
+    dépendent pas du cycle saisonnier; en résolution annuelle, ce sont les
+    valeurs des années elles-mêmes.
+    """
+
+    def __init__(self, df, anchor_year=2000):
+        columns = [name for name in df.columns if name not in ('Year', 'Date')]
+        values = df[columns].to_numpy(dtype=np.float64)
+        years = df['Year'].to_numpy()
+        windows = {name: self._year_window(df, years, year)
+                   for name, year in (('first', years[0]), ('anchor', anchor_year), ('latest', years[-1]))}
+        # Début de période en cours d'année: la première année glissante complète
+        # (à un pas près, pour les années bissextiles) se termine un peu plus tard
+        full = windows['latest'][1] - windows['latest'][0] - 1
+        year = years[0]
+        while windows['first'][1] - windows['first'][0] < full and year < years[-1]:
+            year += 1
+            windows['first'] = self._year_window(df, years, year)
+
+        # Réductions vectorisées sur toutes les colonnes à la fois
+        with np.errstate(invalid='ignore'):
+            self.current = dict(zip(columns, values[-1]))
+            # Moyennes sur l'année glissante: références des variations
+            self.first, self.anchor, self.latest = (
+                dict(zip(columns, np.nanmean(values[start:stop], axis=0)))
+                for start, stop in windows.values())
+            self.minimum = dict(zip(columns, np.nanmin(values, axis=0)))
+            self.maximum = dict(zip(columns, np.nanmax(values, axis=0)))
+            self.mean = dict(zip(columns, np.nanmean(values, axis=0)))
+
+        self.start_year = int(years[0])
+        self.anchor_year = anchor_year
+
+        # Valeur principale
+        self.current_value = self.current['Base_Value']
+        self.mean_value = self.mean['Base_Value']
+        self.min_value = self.minimum['Base_Value']
+        self.max_value = self.maximum['Base_Value']
+        self.total_change = self._change('Base_Value', self.first)
+        self.recent_change = self._change('Base_Value', self.anchor)
+
+        # Risque
+        self.current_risk = self.current.get('Risk_Level')
+        self.risk_change = self._change('Risk_Level', self.anchor)
+        self.risk_class = classify_risk(self.current_risk) if self.current_risk is not None else None
+        self.risk_label = RISK_LABELS.get(self.risk_class)
+        self.risk_color = RISK_COLORS.get(self.risk_class)
+
+        # Impact humain et projections
+        self.human_impact = self.current.get('Human_Impact')
+        self.human_growth = self._change('Human_Impact', self.first)
+        self.future_change = None
+        if 'Future_Projection' in self.current:
+            self.future_change = (self.current['Future_Projection'] / self.current_value - 1) * 100
+
+        self.radar = self._radar_scores(df)
+
+    @staticmethod
+    def _year_window(df, years, year):
+        """Lignes [début, fin) de l'année glissante qui se termine dans `year`
+
+        En résolution infra-annuelle, la fenêtre couvre les douze mois qui se
+        terminent à la même date (même mois, même jour) que la dernière ligne;
+        en résolution annuelle, c'est la ligne de l'année. Une année absente de
+        la période donne la ligne la plus proche.
+        """
+        first, stop = np.searchsorted(years, year), np.searchsorted(years, year, side='right')
+        if first == stop:
+            row = min(int(first), len(years) - 1)
+            return row, row + 1
+        if 'Date' not in df.columns:
+            return int(first), int(first) + 1
+        dates = df['Date'].to_numpy()
+        end = df['Date'].iloc[-1] - pd.DateOffset(years=int(years[-1]) - int(year))
+        end_row = min(max(np.searchsorted(dates, end.to_datetime64(), side='right'), first + 1), stop)
+        start_row = np.searchsorted(dates, (end - pd.DateOffset(years=1)).to_datetime64(), side='right')
+        return int(start_row), int(end_row)
+
+    def _change(self, column, reference):
+        """Variation en % de la dernière année glissante par rapport à une référence"""
+        if column not in self.latest:
+            return None
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return (self.latest[column] / reference[column] - 1) * 100
+
+    def _radar_scores(self, df):
+        """Scores 0-100 du profil environnemental (graphique radar)"""
+        scores = {}
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for category, column in RADAR_COLUMNS.items():
+                if column in self.current:
+                    span = self.maximum[column] - self.minimum[column]
+                    scores[category] = (self.current[column] - self.minimum[column]) / span * 100
+            if self.current_risk is not None:
+                scores['Risque'] = self.current_risk
+
+            # Stabilité: dispersion des variations relatives d'un pas de temps à l'autre
+            base = df['Base_Value'].to_numpy(dtype=np.float64)
+            pct_change = np.diff(base) / base[:-1]
+            pct_change = pct_change[~np.isnan(pct_change)]
+            volatility = np.std(pct_change, ddof=1) if len(pct_change) > 1 else np.nan
+            scores['Stabilité'] = np.minimum(100 - abs(volatility) * 1000, 100)
+
+        order = ['Tendance', 'Risque', 'Impact Humain', 'Événements Extrêmes', 'Stabilité']
+        return {category: scores[category] for category in order if category in scores}
@@ -0,0 +1,169 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager, nullcontext
+
+import numpy as np
+
+# Activation globale du chronométrage (sinon: uniquement dans un run ouvert par TIMER.run)
+TIMING_ENV = 'EARTH_TIMING'
+
+# Fichier de journal JSON (une ligne par run) pour la supervision
+TIMING_LOG_ENV = 'EARTH_TIMING_LOG'
+
+# Nombre de runs conservés par étape pour les percentiles glissants
+TIMING_HISTORY = 200
+
+logger = logging.getLogger('earth.timing')
+
+# Contexte partagé retourné quand le chronométrage est inactif (aucune allocation)
+_DISABLED = nullcontext()
+
+
+class StageTimer:
+    """Chronométrage léger des étapes de génération et d'affichage
+
+    `stage(nom)` mesure un bloc `with`. Hors d'un run et sans activation globale,
+    il retourne un contexte vide partagé: le coût se limite à deux tests. Les
+    étapes d'un run (`run(nom)`, un rerun du dashboard par exemple) sont
+    mémorisées dans l'ordre de début avec leur chemin (étapes englobantes puis
+    l'étape); la durée d'une étape inclut celles de ses sous-étapes. À la fin
+    du run, les durées alimentent un historique glissant (p50/p95) par chemin
+    et une ligne JSON est émise sur le logger `earth.timing`.
+    Chaque thread (session Streamlit) a son propre run en cours; l'historique
+    est partagé, d'où le verrou.
+    """
+
+    def __init__(self, enabled=False, history=TIMING_HISTORY):
+        self.enabled = enabled
+        self.history = defaultdict(lambda: deque(maxlen=history))
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def stage(self, name):
+        """Contexte mesurant l'étape `name` (vide si le chronométrage est inactif)"""
+        if not self.enabled and not self.in_run():
+            return _DISABLED
+        return self._measure(name)
+
+    @contextmanager
+    def _measure(self, name):
+        local = self._local
+        stages = getattr(local, 'stages', None)
+        parent = getattr(local, 'path', ())
+        path = parent + (name,)
+        if stages is not None:
+            # Place réservée au début de l'étape: la liste reste dans l'ordre de début
+            index = len(stages)
+            stages.append((path, None))
+        local.path = path
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            local.path = parent
+            if stages is not None:
+                stages[index] = (path, elapsed)
+            elif not parent:
+                # Étape isolée (hors run, activation globale): enregistrée comme un run
+                # à une étape, sans le détail de ses sous-étapes
+                self._record(name, [(path, elapsed)], elapsed)
+
+    def in_run(self):
+        """Vrai si un run est ouvert dans le thread courant"""
+        return getattr(self._local, 'stages', None) is not None
+
+    def begin_run(self, name):
+        """Ouvre un run dans le thread courant (un run inachevé est abandonné)"""
+        self._local.run = name
+        self._local.stages = []
+        self._local.path = ()
+        self._local.start = time.perf_counter()
+
+    def end_run(self):
+        """Ferme le run courant; retourne ses étapes [(chemin, ms)] dans l'ordre de début"""
+        local = self._local
+        stages = getattr(local, 'stages', None)
+        if stages is None:
+            return []
+        total = (time.perf_counter() - local.start) * 1000
+        local.stages = None
+        stages = [stage for stage in stages if stage[1] is not None]
+        self._record(local.run, stages, total)
+        return stages
+
+    def abort_run(self):
+        """Abandonne le run courant sans l'enregistrer"""
+        self._local.stages = None
+        self._local.path = ()
+
+    @contextmanager
+    def run(self, name):
+        """Run chronométré le temps d'un bloc `with`; le bloc reçoit la liste des étapes
+
+        Le run est toujours fermé en sortie du bloc. Interrompu par une exception
+        (un rerun Streamlit demandé en cours de script par exemple), il est
+        abandonné: une durée partielle fausserait les percentiles.
+        """
+        self.begin_run(name)
+        stages = []
+        try:
+            yield stages
+        except BaseException:
+            self.abort_run()
+            raise
+        stages.extend(self.end_run())
+
+    def _record(self, run, stages, total):
+        # Une étape répétée sous le même chemin (dans une boucle) compte pour sa somme
+        totals = defaultdict(float)
+        for path, elapsed in stages:
+            totals[path] += elapsed
+        with self._lock:
+            self.history[(run, ())].append(total)
+            for path, elapsed in totals.items():
+                self.history[(run, path)].append(elapsed)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps({
+                'event': 'timing',
+                'run': run,
+                'timestamp': time.time(),
+                'total_ms': round(total, 3),
+                'stages': [{'stage': path[-1], 'path': list(path), 'ms': round(elapsed, 3)}
+                           for path, elapsed in stages],
+            }, ensure_ascii=False))
+
+    def percentiles(self, run, percentiles=(50, 95)):
+        """Percentiles glissants (ms) des étapes d'un run: {chemin: (p50, p95, n)}
+
+        Le chemin vide `()` correspond à la durée totale du run.
+        """
+        with self._lock:
+            samples = {path: np.array(durations) for (run_name, path), durations in self.history.items()
+                       if run_name == run and durations}
+        return {path: (*(float(value) for value in np.percentile(durations, percentiles)), len(durations))
+                for path, durations in samples.items()}
+
+    def clear(self):
+        """Vide l'historique"""
+        with self._lock:
+            self.history.clear()
+
+
+def _configure_log_file(path):
+    """Écrit les lignes JSON du logger `earth.timing` dans `path`"""
+    handler = logging.FileHandler(path, encoding='utf-8')
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+
+
+if os.environ.get(TIMING_LOG_ENV):
+    _configure_log_file(os.environ[TIMING_LOG_ENV])
+
+# Chronomètre partagé par Earth.py et le dashboard
+TIMER = StageTimer(enabled=os.environ.get(TIMING_ENV) == '1')